@@ -1,66 +1,75 @@
 """Base class for AI extractors."""
 
+import asyncio
+import copy
+import hashlib
+import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from pathlib import Path
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple, Union
 
+import httpx
 
-class AIExtractor(ABC):
-    """Abstract base class for AI-based information extraction."""
-    
-    @abstractmethod
-    def extract(self, resume_text: str) -> Dict[str, Any]:
-        """
-        Extract structured information from resume text.
-        
-        Args:
-            resume_text: Raw text extracted from PDF
-            
-        Returns:
-            Dictionary containing structured resume information
-        """
-        pass
-    
-    def _get_extraction_prompt(self, resume_text: str) -> str:
-        """
-        Generate the prompt for extracting resume information.
-        
-        Args:
-            resume_text: Raw text extracted from PDF
-            
-        Returns:
-            Formatted prompt string
-        """
-        prompt = f"""Extract structured information from the following resume text.
-Return the result as a valid JSON object that matches this schema:
+from .cache import ExtractionCache
+from .schema import ADDRESS_TYPES, EDUCATION_LEVELS, GENDERS, validate_resume
+from .semantic_cache import SemanticCache
+
+# Bump whenever the extraction prompt changes so cached results are invalidated
+PROMPT_VERSION = "v1"
+
+logger = logging.getLogger(__name__)
+
+# Resume text beyond this many characters is not sent to the model; the
+# first pages of a resume carry nearly all of the extracted fields
+DEFAULT_MAX_CHARS = 24000
+
+# Output token budget per resume. Only bounds runaway generation: a resume
+# with a long employment history can need well over 2,000 tokens of JSON,
+# and output cut off at the limit fails the extraction
+MAX_OUTPUT_TOKENS = 4096
+
+# Output budget per resume in a combined batch request, and its ceiling for
+# the whole request. A combined request cut off at the limit falls back to
+# one request per resume
+BATCH_OUTPUT_TOKENS_PER_RESUME = 1500
+MAX_BATCH_OUTPUT_TOKENS = 8192
 
-{{
-  "user_info": {{
+# Connection pool shared by every request an extractor makes, so TCP/TLS
+# connections are reused across resumes
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+SYSTEM_PROMPT = "You are a resume parser. Extract structured information from resumes and return valid JSON only."
+
+_SCHEMA_TEMPLATE = Template("""{
+  "user_info": {
     "name": "",
     "date_of_birth": "YYYY-MM-DD or empty",
-    "gender": "male|female|other",
+    "gender": "$genders",
     "email": "",
     "phone_number": ""
-  }},
+  },
   "addresses": [
-    {{
-      "type": "present|permanent",
+    {
+      "type": "$address_types",
       "address": "full address line",
       "post_name": "",
       "post_code": ""
-    }}
+    }
   ],
   "academic_education": [
-    {{
-      "levels": "jsc|ssc|hsc|o_level|a_level|bachelors|masters|phd|diploma|ca_qualified|ca_cc|cma_qualified|cma_student|acca|cs|mbbs|bds|llb|llm|other",
+    {
+      "levels": "$education_levels",
       "subject": "",
       "board": "",
       "institute": "",
       "passing_year": "",
       "result": ""
-    }}
+    }
   ],
   "employment": [
-    {{
+    {
       "company_name": "",
       "company_type": "",
       "position": "",
@@ -68,20 +77,591 @@ Return the result as a valid JSON object that matches this schema:
       "leaving_date": "YYYY-MM-DD or empty",
       "currently_working": true,
       "responsibility": ""
-    }}
+    }
   ],
   "skills": ["skill one", "skill two"]
-}}
+}""")
 
-Guidelines:
+# Allowed values come from schema.py so the prompt cannot drift from models.py
+RESUME_SCHEMA = _SCHEMA_TEMPLATE.substitute(
+    genders="|".join(GENDERS),
+    address_types="|".join(ADDRESS_TYPES),
+    education_levels="|".join(EDUCATION_LEVELS)
+)
+
+EXTRACTION_GUIDELINES = """Guidelines:
 - Fill missing values with empty strings.
 - Use arrays even if there is only one item.
 - Only include address types that appear in the resume.
-- Use ISO date format when possible.
+- Use ISO date format when possible."""
+
+# The prompts only vary by resume text, so the fixed parts are built once
+_PROMPT_PREFIX = f"""Extract structured information from the following resume text.
+Return the result as a valid JSON object that matches this schema:
+
+{RESUME_SCHEMA}
+
+{EXTRACTION_GUIDELINES}
 
 Resume text:
-{resume_text}
+"""
+
+_PROMPT_SUFFIX = "\n\nReturn only the JSON object, no additional text or explanation."
+
+_BATCH_PROMPT_HEADER = "Extract structured information from each of the following {count} resumes.\n"
+
+_BATCH_PROMPT_INSTRUCTIONS = f"""Return the result as a valid JSON object of the form {{"results": [...]}}, where
+"results" contains exactly one object per resume, in the same order as the
+resumes appear. Each object must match this schema:
+
+{RESUME_SCHEMA}
+
+{EXTRACTION_GUIDELINES}
+- Never mix information from different resumes.
+
+Resumes (each delimited by <<<DOC id=N>>> and <<<END>>>):
+"""
+
+
+class AIExtractor(ABC):
+    """Abstract base class for AI-based information extraction."""
+    
+    provider = ""
+    
+    def __init__(
+        self,
+        model: str,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        map_reduce: bool = False,
+        semantic_cache: bool = False
+    ):
+        """
+        Initialize the extractor.
+        
+        Args:
+            model: Model name (provider-specific)
+            cache_dir: Directory for cached extraction results (caching disabled if None)
+            max_chars: Maximum resume characters sent per request (unlimited if None)
+            map_reduce: Split resumes longer than max_chars into section chunks,
+                extract them one request per chunk and merge the results,
+                instead of truncating them
+            semantic_cache: Also reuse results of near-duplicate resumes by
+                embedding similarity (requires cache_dir, numpy and
+                sentence-transformers)
+            
+        Raises:
+            ValueError: If semantic_cache is requested without a cache_dir
+        """
+        self.model = model
+        self.max_chars = max_chars
+        self.map_reduce = map_reduce
+        self.cache = ExtractionCache(cache_dir) if cache_dir else None
+        self.semantic_cache = None
+        if semantic_cache:
+            if not cache_dir:
+                raise ValueError("The semantic cache requires a cache directory")
+            self.semantic_cache = SemanticCache(Path(cache_dir) / "semantic" / self._cache_namespace())
+        self._async_client = None
+        self._async_client_loop = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+    
+    def extract(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Extract structured information from resume text.
+        
+        Results are served from the extraction cache (and the semantic cache
+        for near-duplicates) when configured, so the model is only invoked
+        for resume text it has not seen before.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+        """
+        if self._needs_map_reduce(resume_text):
+            return self._extract_map_reduce(resume_text)
+        
+        cached, embeddings = self._lookup_cached([resume_text])
+        if cached[0] is not None:
+            return cached[0]
+        
+        result = self._extract_impl(resume_text)
+        self._store_cached([resume_text], {0: result}, embeddings)
+        return result
+    
+    async def aextract(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured information from resume text.
+        
+        Uses the same caches as extract. On a cache miss, a warm-up already
+        started on this loop (see start_warm_up) is awaited before the
+        request; none is started here, as it would only add a round trip.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+        """
+        loop = asyncio.get_running_loop()
+        if self._needs_map_reduce(resume_text):
+            return await loop.run_in_executor(None, self._extract_map_reduce, resume_text)
+        
+        if self.semantic_cache is None:
+            cached, embeddings = self._lookup_cached([resume_text])
+        else:
+            # Embedding is CPU-bound; keep it off the event loop
+            cached, embeddings = await loop.run_in_executor(None, self._lookup_cached, [resume_text])
+        if cached[0] is not None:
+            return cached[0]
+        
+        warm_up = self._warm_up_task
+        if warm_up is not None and warm_up.get_loop() is loop:
+            try:
+                # Shielded: one cancelled resume must not cancel the shared task
+                await asyncio.shield(warm_up)
+            except Exception:
+                # Provider errors are reported by the extraction request below
+                pass
+        
+        result = await self._aextract_impl(resume_text)
+        self._store_cached([resume_text], {0: result}, embeddings)
+        return result
+
+    async def awarm_up(self) -> None:
+        """
+        Prepare the provider for the first extraction request.
+
+        Runs through start_warm_up, at most once per event loop. The default
+        implementation does nothing; failures are left for the extraction
+        request to report.
+        """
+        return None
+
+    def start_warm_up(self) -> asyncio.Task:
+        """
+        Start awarm_up on the running event loop, unless it already was.
+
+        Concurrent callers on the same loop share one task, so the provider
+        is prepared once however many resumes are parsed at the same time.
+
+        Returns:
+            The warm-up task of the running loop
+        """
+        loop = asyncio.get_running_loop()
+        task = self._warm_up_task
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self.awarm_up())
+            # Failures are reported by extraction requests; retrieve them
+            # here so an unawaited task does not log them as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._warm_up_task = task
+        return task
+
+    def extract_batch(self, resume_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extract structured information from several resume texts.
+        
+        Cached resumes are answered from the caches; the rest are handed to
+        the model together so providers can share a single request. Texts
+        longer than max_chars are truncated.
+        
+        Failures are isolated per text: a resume the model cannot extract
+        does not prevent the others from being returned and cached.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            One entry per text, in input order: the structured resume
+            information, or the exception raised while extracting that text
+        """
+        results, embeddings = self._lookup_cached(resume_texts)
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if pending:
+            extracted = self._extract_batch_impl([resume_texts[i] for i in pending])
+            new_results = {
+                i: result for i, result in zip(pending, extracted)
+                if not isinstance(result, Exception)
+            }
+            self._store_cached(resume_texts, new_results, embeddings)
+            for i, result in zip(pending, extracted):
+                results[i] = result
+        
+        return results
+    
+    @abstractmethod
+    def _extract_impl(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Extract structured information by invoking the model.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+        """
+        pass
+    
+    def _extract_batch_impl(self, resume_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extract several resumes by invoking the model.
+        
+        The default implementation issues one request per resume; providers
+        override it to combine resumes into a single request.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            One entry per text, in input order: the structured resume
+            information, or the exception raised while extracting that text
+        """
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for resume_text in resume_texts:
+            try:
+                results.append(self._extract_impl(resume_text))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def _aextract_impl(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured information by invoking the model.
+        
+        The default implementation runs _extract_impl in the default
+        executor; providers with async clients override it.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._extract_impl, resume_text)
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a prompt.
+        
+        Args:
+            prompt: User prompt
+            
+        Returns:
+            System and user messages
+        """
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _get_async_client(self) -> Any:
+        """
+        Return the async client for the running event loop.
+        
+        Async HTTP clients are bound to the loop they were first used on, so
+        a new one is created whenever the extractor is used from a new loop.
+        
+        Returns:
+            Provider-specific async client
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = self._create_async_client()
+            self._async_client_loop = loop
+        return self._async_client
+    
+    @abstractmethod
+    def _create_async_client(self) -> Any:
+        """
+        Create the provider-specific async client.
+        
+        Returns:
+            Async client instance
+        """
+        pass
+    
+    def _lookup_cached(self, resume_texts: List[str]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[int, Any]]:
+        """
+        Look up resumes in the extraction cache, then the semantic cache.
+        
+        Semantic hits are copied into the extraction cache under the exact
+        text's key.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            Cached result per text (None on a miss), and the embeddings of
+            missed texts by index, for storing their results later
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(resume_texts)
+        if self.cache is not None:
+            results = [self.cache.get(self._cache_key(text)) for text in resume_texts]
+        
+        embeddings: Dict[int, Any] = {}
+        missing = [i for i, result in enumerate(results) if result is None]
+        if self.semantic_cache is not None and missing:
+            vectors = self.semantic_cache.embed([resume_texts[i] for i in missing])
+            hits = self.semantic_cache.lookup(vectors)
+            for i, vector, hit in zip(missing, vectors, hits):
+                if hit is None:
+                    embeddings[i] = vector
+                    continue
+                results[i] = hit
+                if self.cache is not None:
+                    # Later runs on this exact text then skip the embedding
+                    self.cache.put(self._cache_key(resume_texts[i]), hit)
+        
+        return results, embeddings
+    
+    def _store_cached(
+        self,
+        resume_texts: List[str],
+        results: Dict[int, Dict[str, Any]],
+        embeddings: Dict[int, Any]
+    ) -> None:
+        """
+        Store newly extracted results in the configured caches.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            results: New extraction results by text index
+            embeddings: Embeddings of the missed texts by index, from _lookup_cached
+        """
+        if self.cache is not None:
+            for i, result in results.items():
+                self.cache.put(self._cache_key(resume_texts[i]), result)
+        
+        if self.semantic_cache is not None:
+            indices = [i for i in results if i in embeddings]
+            if indices:
+                self.semantic_cache.add(
+                    [embeddings[i] for i in indices],
+                    [results[i] for i in indices]
+                )
+    
+    def _needs_map_reduce(self, resume_text: str) -> bool:
+        """Return whether a resume should be extracted in chunks."""
+        return self.map_reduce and bool(self.max_chars) and len(resume_text) > self.max_chars
+    
+    def _extract_map_reduce(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Extract a long resume chunk by chunk and merge the results.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Merged dictionary of structured resume information
+        """
+        chunks = _split_sections(resume_text, self.max_chars)
+        logger.info("Extracting %d-character resume in %d chunks", len(resume_text), len(chunks))
+        # One request per chunk: a combined batch prompt would send the whole
+        # resume at once, which is what max_chars is meant to prevent
+        return _merge_extractions([self.extract(chunk) for chunk in chunks])
+    
+    def _truncate(self, resume_text: str) -> str:
+        """
+        Limit resume text to max_chars characters.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Resume text, truncated if it exceeds max_chars
+        """
+        if not self.max_chars or len(resume_text) <= self.max_chars:
+            return resume_text
+        logger.warning(
+            "Resume text truncated from %d to %d characters", len(resume_text), self.max_chars
+        )
+        return resume_text[:self.max_chars]
+    
+    def _cache_namespace(self) -> str:
+        """
+        Name the semantic cache partition for this provider, model, prompt and max_chars.
+        
+        Embeddings cover the whole resume text while the model only saw the
+        first max_chars characters, so each limit gets its own partition.
+        
+        Returns:
+            Directory name unique to the extraction configuration
+        """
+        material = f"{self.provider}\x00{self.model}\x00{PROMPT_VERSION}\x00{self.max_chars}"
+        return f"{self.provider}-{hashlib.sha256(material.encode('utf-8')).hexdigest()[:16]}"
+    
+    def _cache_key(self, resume_text: str) -> str:
+        """
+        Build the cache key for a resume.
+        
+        Only the text the model is sent (the first max_chars characters) is
+        hashed, so a result extracted from truncated text is never served
+        for the full text under a larger limit.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Hex digest over provider, model, prompt version and the resume
+            text sent to the model
+        """
+        if self.max_chars:
+            resume_text = resume_text[:self.max_chars]
+        material = f"{self.provider}\x00{self.model}\x00{PROMPT_VERSION}\x00{resume_text}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def _get_extraction_prompt(self, resume_text: str) -> str:
+        """
+        Generate the prompt for extracting resume information.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Formatted prompt string
+        """
+        return _PROMPT_PREFIX + self._truncate(resume_text) + _PROMPT_SUFFIX
+    
+    def _get_batch_extraction_prompt(self, resume_texts: List[str]) -> str:
+        """
+        Generate the prompt for extracting several resumes in one request.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            Formatted prompt string
+        """
+        documents = "\n\n".join(
+            f"<<<DOC id={i}>>>\n{self._truncate(text)}\n<<<END>>>"
+            for i, text in enumerate(resume_texts)
+        )
+        return (
+            _BATCH_PROMPT_HEADER.format(count=len(resume_texts))
+            + _BATCH_PROMPT_INSTRUCTIONS
+            + documents
+            + _PROMPT_SUFFIX
+        )
+    
+    def _batch_output_tokens(self, count: int) -> int:
+        """
+        Return the output token budget of a combined request.
+        
+        Args:
+            count: Number of resumes in the request
+            
+        Returns:
+            Maximum number of tokens to generate
+        """
+        return min(BATCH_OUTPUT_TOKENS_PER_RESUME * count, MAX_BATCH_OUTPUT_TOKENS)
+    
+    def _split_batch_response(self, data: Any, expected: int) -> List[Dict[str, Any]]:
+        """
+        Split a combined batch response into per-resume results.
+        
+        Args:
+            data: Parsed JSON response of a batch request
+            expected: Number of resumes sent in the batch
+            
+        Returns:
+            One result dictionary per resume, in request order
+            
+        Raises:
+            ValueError: If the response does not contain one valid object per resume
+        """
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list) or len(results) != expected:
+            raise ValueError(f"Batch response does not contain {expected} results")
+        for result in results:
+            validate_resume(result)
+        return results
+
+
+# Short lines that are all caps, end with a colon, or start with a common
+# resume section title
+_SECTION_HEADING_RE = re.compile(
+    r"^(?:[A-Z][A-Z &/-]{2,40}|[^\n]{1,40}:|(?i:education|experience|employment|work history|"
+    r"skills|projects|certifications?|training|languages|references|personal)\b[^\n]{0,30})$",
+    re.MULTILINE
+)
+
+
+def _split_sections(text: str, max_chars: int) -> List[str]:
+    """
+    Split resume text into chunks of at most max_chars, breaking at section headings.
+    
+    Sections are packed greedily into chunks; a section that is itself too
+    long is split at line boundaries (or hard-split if a line is too long).
+    
+    Args:
+        text: Resume text
+        max_chars: Maximum chunk length
+        
+    Returns:
+        Text chunks in document order
+    """
+    boundaries = [m.start() for m in _SECTION_HEADING_RE.finditer(text) if m.start() > 0]
+    sections = [text[start:end] for start, end in zip([0] + boundaries, boundaries + [len(text)])]
+    
+    pieces = []
+    for section in sections:
+        if len(section) <= max_chars:
+            pieces.append(section)
+            continue
+        for line in section.splitlines(keepends=True):
+            pieces.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+    
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+def _merge_extractions(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extraction results into one result.
+    
+    Nested objects are merged recursively, lists are unioned in order and
+    the first non-empty scalar wins. The input results are not modified;
+    they may be cache entries.
+    
+    Args:
+        results: Extraction results in document order
+        
+    Returns:
+        Merged extraction result
+    """
+    merged: Dict[str, Any] = {}
+    for result in results:
+        _merge_into(merged, result)
+    return merged
 
-Return only the JSON object, no additional text or explanation."""
-        return prompt
 
+def _merge_into(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for key, value in source.items():
+        current = target.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _merge_into(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(copy.deepcopy(item) for item in value if item not in current)
+        elif current in (None, "") and value not in (None, ""):
+            target[key] = copy.deepcopy(value)
+        elif key not in target:
+            target[key] = copy.deepcopy(value)
@@ -0,0 +1,83 @@
+"""On-disk cache for AI extraction results."""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """Content-addressable cache storing one JSON file per extraction result."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached extraction result.
+
+        Args:
+            key: Hex digest identifying the entry
+
+        Returns:
+            Cached result, or None on a miss or unreadable entry
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        result = entry.get("result") if isinstance(entry, dict) else None
+        return result if isinstance(result, dict) else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an extraction result.
+
+        The entry is written to a temporary file and moved into place so that
+        concurrent readers never observe a partially written entry. Write
+        errors (e.g. a full or read-only cache directory) are logged and
+        otherwise ignored, like read errors in get.
+
+        Args:
+            key: Hex digest identifying the entry
+            value: Extraction result to store
+        """
+        entry = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "result": value
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError as e:
+            logger.warning("Could not write extraction cache entry %s: %s", key, e)
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
+            logger.warning("Could not write extraction cache entry %s: %s", key, e)
+
+    def _path(self, key: str) -> Path:
+        """Return the file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
@@ -1,17 +1,36 @@
 """Factory for creating AI extractor instances."""
 
+from functools import lru_cache
 from typing import Optional
 import os
 from dotenv import load_dotenv
 
-from .base import AIExtractor
-from .ollama_extractor import OllamaExtractor
-from .openai_extractor import OpenAIExtractor
+from .base import AIExtractor, DEFAULT_MAX_CHARS
 
 # Load environment variables
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
+def _create_ollama(model: str, base_url: str, cache_dir: Optional[str],
+                   max_chars: Optional[int], map_reduce: bool, semantic_cache: bool) -> AIExtractor:
+    # Provider modules pull in their client libraries, which are slow to
+    # import, so only the one in use is loaded
+    from .ollama_extractor import OllamaExtractor
+    return OllamaExtractor(model=model, base_url=base_url, cache_dir=cache_dir,
+                           max_chars=max_chars, map_reduce=map_reduce,
+                           semantic_cache=semantic_cache)
+
+
+@lru_cache(maxsize=None)
+def _create_openai(api_key: Optional[str], model: str, cache_dir: Optional[str],
+                   max_chars: Optional[int], map_reduce: bool, semantic_cache: bool) -> AIExtractor:
+    from .openai_extractor import OpenAIExtractor
+    return OpenAIExtractor(api_key=api_key, model=model, cache_dir=cache_dir,
+                           max_chars=max_chars, map_reduce=map_reduce,
+                           semantic_cache=semantic_cache)
+
+
 class AIExtractorFactory:
     """Factory for creating AI extractor instances."""
     
@@ -20,25 +39,41 @@ class AIExtractorFactory:
         provider: str = "ollama",
         model: Optional[str] = None,
         api_key: Optional[str] = None,
-        ollama_base_url: Optional[str] = None
+        ollama_base_url: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        map_reduce: bool = False,
+        semantic_cache: bool = False
     ) -> AIExtractor:
         """
         Create an AI extractor instance.
         
+        Instances are shared between calls with the same configuration, so
+        their HTTP clients and pooled connections are reused.
+        
         Args:
             provider: Provider name ("ollama" or "openai")
             model: Model name (provider-specific)
             api_key: API key for OpenAI (optional, reads from env if not provided)
             ollama_base_url: Base URL for Ollama server (optional, defaults to localhost)
+            cache_dir: Directory for cached extraction results (optional, reads
+                RESUME_CACHE_DIR from env if not provided; caching disabled if unset)
+            max_chars: Maximum resume characters sent per request (unlimited if None)
+            map_reduce: Extract resumes longer than max_chars in chunks instead of truncating
+            semantic_cache: Also reuse results of near-duplicate resumes (requires a cache directory)
             
         Returns:
             AIExtractor instance
             
         Raises:
-            ValueError: If provider is not supported
+            ValueError: If provider is not supported, or semantic_cache is
+                requested without a cache directory
         """
         provider = provider.lower()
         
+        # Get cache directory from parameter or environment
+        cache_dir = cache_dir or os.getenv("RESUME_CACHE_DIR")
+        
         if provider == "ollama":
             # Default model for Ollama
             if not model:
@@ -47,7 +82,7 @@ class AIExtractorFactory:
             # Get Ollama base URL from parameter or environment
             base_url = ollama_base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
             
-            return OllamaExtractor(model=model, base_url=base_url)
+            return _create_ollama(model, base_url, cache_dir, max_chars, map_reduce, semantic_cache)
         
         elif provider == "openai":
             # Default model for OpenAI
@@ -57,7 +92,7 @@ class AIExtractorFactory:
             # Get API key from parameter or environment
             key = api_key or os.getenv("OPENAI_API_KEY")
             
-            return OpenAIExtractor(api_key=key, model=model)
+            return _create_openai(key, model, cache_dir, max_chars, map_reduce, semantic_cache)
         
         else:
             raise ValueError(f"Unsupported provider: {provider}. Supported providers: ollama, openai")
@@ -1,27 +1,82 @@
 """Ollama-based AI extractor."""
 
-import json
+import asyncio
+import logging
+import re
+import time
 import ollama
-from typing import Dict, Any, Optional
-from .base import AIExtractor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+from .base import AIExtractor, DEFAULT_MAX_CHARS, HTTP_LIMITS, MAX_OUTPUT_TOKENS
+from .schema import JsonSchemaException, validate_resume
+from .. import json_utils
+
+logger = logging.getLogger(__name__)
+
+# Requests whose output is not valid JSON or fails schema validation are
+# re-sent with the error appended, waiting RETRY_BACKOFF * attempt seconds
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 1.0
+
+# Seconds a successful server health check stays valid
+_HEALTH_TTL = 60.0
+
+# How long the server keeps the model loaded after a request. Ollama reuses
+# the KV cache of the shared instruction prefix while the model stays
+# loaded, so only the resume text is evaluated on later requests
+KEEP_ALIVE = "30m"
+
+# Context window requested for every request. Ollama reloads the model
+# whenever num_ctx changes, so it is the same for single, batch and warm-up
+# requests; 8192 is llama3's trained context and fits a resume of
+# DEFAULT_MAX_CHARS characters with the instructions and its output
+NUM_CTX = 8192
+
+# Typical characters per token, used to decide which resumes fit into one
+# combined request
+_CHARS_PER_TOKEN = 4
+
+# Characters that affect brace matching; everything else is skipped in C
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
 
 
 class OllamaExtractor(AIExtractor):
     """Extract information using Ollama open source models."""
     
-    def __init__(self, model: str = "llama3", base_url: str = "http://localhost:11434"):
+    provider = "ollama"
+    
+    def __init__(
+        self,
+        model: str = "llama3",
+        base_url: str = "http://localhost:11434",
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        map_reduce: bool = False,
+        semantic_cache: bool = False
+    ):
         """
         Initialize Ollama extractor.
         
         Args:
             model: Model name (e.g., llama3, mistral, llama3.2)
             base_url: Ollama server base URL
+            cache_dir: Directory for cached extraction results (caching disabled if None)
+            max_chars: Maximum resume characters sent per request (unlimited if None)
+            map_reduce: Extract resumes longer than max_chars in chunks instead of truncating
+            semantic_cache: Also reuse results of near-duplicate resumes (requires cache_dir)
         """
-        self.model = model
+        super().__init__(
+            model=model,
+            cache_dir=cache_dir,
+            max_chars=max_chars,
+            map_reduce=map_reduce,
+            semantic_cache=semantic_cache
+        )
         self.base_url = base_url
-        self.client = ollama.Client(host=base_url)
+        self.client = ollama.Client(host=base_url, limits=HTTP_LIMITS)
+        self._health_checked_at: Optional[float] = None
     
-    def extract(self, resume_text: str) -> Dict[str, Any]:
+    def _extract_impl(self, resume_text: str) -> Dict[str, Any]:
         """
         Extract structured information using Ollama.
         
@@ -43,52 +98,403 @@ class OllamaExtractor(AIExtractor):
         
         prompt = self._get_extraction_prompt(resume_text)
         
+        try:
+            # Sometimes models return JSON wrapped in markdown code blocks;
+            # _parse_response strips those before parsing
+            return self._request_with_feedback(prompt)
+            
+        except json_utils.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON from Ollama response: {str(e)}")
+        except JsonSchemaException as e:
+            raise ValueError(f"Ollama response does not match the resume schema: {e.message}")
+        except Exception as e:
+            raise ValueError(f"Error during extraction: {str(e)}")
+    
+    async def _aextract_impl(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured information using Ollama.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+            
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+            ValueError: If extraction fails or returns invalid JSON
+        """
+        try:
+            await self._acheck_server_health()
+        except Exception as e:
+            raise ConnectionError(f"Ollama server not available at {self.base_url}: {str(e)}")
+        
+        prompt = self._get_extraction_prompt(resume_text)
+        
+        try:
+            return await self._arequest_with_feedback(prompt)
+            
+        except json_utils.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON from Ollama response: {str(e)}")
+        except JsonSchemaException as e:
+            raise ValueError(f"Ollama response does not match the resume schema: {e.message}")
+        except Exception as e:
+            raise ValueError(f"Error during extraction: {str(e)}")
+    
+    async def awarm_up(self) -> None:
+        """
+        Check the server and load the model into memory ahead of the first request.
+
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+        """
+        if self._health_check_is_fresh():
+            return
+        await self._acheck_server_health()
+        # A generate request without a prompt only loads the model; it needs
+        # the extraction options, or a different num_ctx reloads it later
+        await self._get_async_client().generate(
+            model=self.model,
+            prompt="",
+            options=self._chat_options(MAX_OUTPUT_TOKENS),
+            keep_alive=KEEP_ALIVE
+        )
+
+    def _extract_batch_impl(self, resume_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extract several resumes with combined Ollama requests.
+        
+        Resumes are grouped so that each combined prompt and its output fit
+        into NUM_CTX. A group falls back to one request per resume if the
+        combined request fails, its response cannot be parsed or it does not
+        contain one result per resume.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            One entry per text, in input order: the structured resume
+            information, or the exception raised while extracting that text
+            
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+        """
+        if len(resume_texts) < 2:
+            return super()._extract_batch_impl(resume_texts)
+        
+        try:
+            self._check_server_health()
+        except Exception as e:
+            raise ConnectionError(f"Ollama server not available at {self.base_url}: {str(e)}")
+        
+        results: List[Union[Dict[str, Any], Exception]] = []
+        for group in self._context_groups(resume_texts):
+            results.extend(self._extract_group(group))
+        return results
+    
+    def _context_groups(self, resume_texts: List[str]) -> List[List[str]]:
+        """
+        Split resumes into consecutive groups whose combined request fits into NUM_CTX.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            Groups of resume texts, in input order
+        """
+        groups: List[List[str]] = []
+        current: List[str] = []
+        for resume_text in resume_texts:
+            candidate = current + [resume_text]
+            prompt_tokens = len(self._get_batch_extraction_prompt(candidate)) // _CHARS_PER_TOKEN
+            if current and prompt_tokens + self._batch_output_tokens(len(candidate)) > NUM_CTX:
+                groups.append(current)
+                candidate = [resume_text]
+            current = candidate
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _extract_group(self, resume_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extract a group of resumes with a single request.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            One entry per text, in input order: the structured resume
+            information, or the exception raised while extracting that text
+        """
+        if len(resume_texts) < 2:
+            return super()._extract_batch_impl(resume_texts)
+        
+        prompt = self._get_batch_extraction_prompt(resume_texts)
+        
+        try:
+            response_text = self._chat(
+                self._build_messages(prompt),
+                max_tokens=self._batch_output_tokens(len(resume_texts))
+            )
+            parsed_data = json_utils.loads(self._extract_json_from_response(response_text))
+            return self._split_batch_response(parsed_data, len(resume_texts))
+        except Exception as e:
+            logger.warning(
+                "Combined Ollama request for %d resumes failed, extracting them one by one: %s",
+                len(resume_texts), e
+            )
+            # Combined request was unusable; extract each resume on its own so
+            # one bad resume only fails itself
+            return super()._extract_batch_impl(resume_texts)
+    
+    def _request_with_feedback(self, prompt: str) -> Dict[str, Any]:
+        """
+        Request an extraction, re-prompting when the output is invalid.
+        
+        Args:
+            prompt: Extraction prompt for a single resume
+            
+        Returns:
+            Parsed and validated resume information
+            
+        Raises:
+            JSONDecodeError: If the response is still not valid JSON on the last attempt
+            JsonSchemaException: If the response still fails validation on the last attempt
+        """
+        messages = self._build_messages(prompt)
+        for attempt in range(MAX_ATTEMPTS):
+            response_text = self._chat(messages)
+            try:
+                return self._parse_response(response_text)
+            except (json_utils.JSONDecodeError, JsonSchemaException) as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                self._log_retry(attempt, e)
+                messages = messages + self._feedback_messages(response_text, e)
+                time.sleep(RETRY_BACKOFF * (attempt + 1))
+    
+    async def _arequest_with_feedback(self, prompt: str) -> Dict[str, Any]:
+        """
+        Asynchronously request an extraction, re-prompting when the output is invalid.
+        
+        Args:
+            prompt: Extraction prompt for a single resume
+            
+        Returns:
+            Parsed and validated resume information
+            
+        Raises:
+            JSONDecodeError: If the response is still not valid JSON on the last attempt
+            JsonSchemaException: If the response still fails validation on the last attempt
+        """
+        messages = self._build_messages(prompt)
+        for attempt in range(MAX_ATTEMPTS):
+            response_text = await self._achat(messages)
+            try:
+                return self._parse_response(response_text)
+            except (json_utils.JSONDecodeError, JsonSchemaException) as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                self._log_retry(attempt, e)
+                messages = messages + self._feedback_messages(response_text, e)
+                await asyncio.sleep(RETRY_BACKOFF * (attempt + 1))
+    
+    def _log_retry(self, attempt: int, error: Exception) -> None:
+        """
+        Report a retried extraction so operators can track the retry rate.
+        
+        Args:
+            attempt: Zero-based index of the failed attempt
+            error: Parse or validation error of the failed attempt
+        """
+        logger.warning(
+            "Retrying %s extraction with %s (attempt %d/%d): %s: %s",
+            self.provider, self.model, attempt + 2, MAX_ATTEMPTS,
+            type(error).__name__, self._error_message(error)
+        )
+    
+    def _feedback_messages(self, response_text: str, error: Exception) -> List[Dict[str, str]]:
+        """
+        Build the follow-up messages asking the model to correct its output.
+        
+        Args:
+            response_text: Rejected response text
+            error: Parse or validation error for the response
+            
+        Returns:
+            Assistant and user messages to append to the conversation
+        """
+        if isinstance(error, JsonSchemaException):
+            feedback = f"Your last output did not match the required schema: {error.message}. "
+        else:
+            feedback = f"Your last output failed JSON parsing: {self._error_message(error)}. "
+        return [
+            {
+                "role": "assistant",
+                "content": response_text
+            },
+            {
+                "role": "user",
+                "content": feedback + "Return ONLY a valid JSON object that matches the schema."
+            }
+        ]
+    
+    def _error_message(self, error: Exception) -> str:
+        """Return the human-readable part of a parse or validation error."""
+        return getattr(error, "message", None) or str(error)
+    
+    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+        """
+        Parse and validate the model output for a single resume.
+        
+        Args:
+            response_text: Raw response text
+            
+        Returns:
+            Parsed resume information
+            
+        Raises:
+            JSONDecodeError: If the response is not valid JSON
+            JsonSchemaException: If the response does not match the resume schema
+        """
+        data = json_utils.loads(self._extract_json_from_response(response_text))
+        validate_resume(data)
+        return data
+    
+    def _chat(self, messages: List[Dict[str, str]], max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
+        """
+        Send a conversation to the model and return the response text.
+        
+        Args:
+            messages: Chat messages (role/content dictionaries)
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            Raw response text
+            
+        Raises:
+            ValueError: If the output was cut off by the max_tokens budget
+        """
         try:
             # Use chat completion for better structured output
             response = self.client.chat(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a resume parser. Extract structured information from resumes and return valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                options={
-                    "temperature": 0.1,  # Lower temperature for more consistent JSON output
-                    "format": "json"  # Request JSON format
-                }
+                messages=messages,
+                format="json",  # Request JSON format
+                stream=False,
+                options=self._chat_options(max_tokens),
+                keep_alive=KEEP_ALIVE
             )
+        except Exception:
+            # Re-check the server before the next request
+            self._health_checked_at = None
+            raise
+        return self._response_text(response, max_tokens)
+    
+    async def _achat(self, messages: List[Dict[str, str]], max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
+        """
+        Asynchronously send a conversation to the model and return the response text.
+        
+        Args:
+            messages: Chat messages (role/content dictionaries)
+            max_tokens: Maximum number of tokens to generate
             
-            # Extract the response text
-            # Ollama chat returns message content
-            response_text = response.get('message', {}).get('content', '')
-            if not response_text:
-                # Fallback to direct response field
-                response_text = response.get('response', '')
+        Returns:
+            Raw response text
             
-            # Try to parse JSON from response
-            # Sometimes models return JSON wrapped in markdown code blocks
-            json_text = self._extract_json_from_response(response_text)
+        Raises:
+            ValueError: If the output was cut off by the max_tokens budget
+        """
+        try:
+            response = await self._get_async_client().chat(
+                model=self.model,
+                messages=messages,
+                format="json",  # Request JSON format
+                stream=False,
+                options=self._chat_options(max_tokens),
+                keep_alive=KEEP_ALIVE
+            )
+        except Exception:
+            # Re-check the server before the next request
+            self._health_checked_at = None
+            raise
+        return self._response_text(response, max_tokens)
+    
+    def _create_async_client(self) -> ollama.AsyncClient:
+        """Create an async Ollama client for the configured server."""
+        return ollama.AsyncClient(host=self.base_url, limits=HTTP_LIMITS)
+    
+    def _chat_options(self, max_tokens: int) -> Dict[str, Any]:
+        """
+        Return the generation options used for extraction requests.
+        
+        Args:
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            Ollama model options
+        """
+        return {
+            "temperature": 0.1,  # Lower temperature for more consistent JSON output
+            "top_p": 0.1,
+            "num_predict": max_tokens,  # Cap decode steps
+            # Ollama's default window silently drops the start of longer
+            # prompts, e.g. the instructions of a batch request
+            "num_ctx": NUM_CTX
+        }
+    
+    def _response_text(self, response: Any, max_tokens: int) -> str:
+        """
+        Get the generated text from a chat response.
+        
+        Args:
+            response: Ollama chat response
+            max_tokens: Maximum number of tokens the request could generate
             
-            parsed_data = json.loads(json_text)
-            return parsed_data
+        Returns:
+            Raw response text
             
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse JSON from Ollama response: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Error during extraction: {str(e)}")
+        Raises:
+            ValueError: If the output was cut off by the max_tokens budget
+        """
+        if response.get('done_reason') == 'length':
+            # Truncated JSON; re-prompting under the same budget cannot help
+            raise ValueError(f"Ollama output was cut off at the {max_tokens}-token limit")
+        # Ollama chat returns message content
+        response_text = response.get('message', {}).get('content', '')
+        if not response_text:
+            # Fallback to direct response field
+            response_text = response.get('response', '')
+        return response_text
     
     def _check_server_health(self):
-        """Check if Ollama server is running and accessible."""
+        """Check if Ollama server is running and accessible (cached for _HEALTH_TTL seconds)."""
+        if self._health_check_is_fresh():
+            return
         try:
             # Try to list models to verify server is up
             self.client.list()
         except Exception as e:
             raise ConnectionError(f"Cannot connect to Ollama server: {str(e)}")
+        self._health_checked_at = time.monotonic()
+    
+    async def _acheck_server_health(self):
+        """Asynchronously check if Ollama server is running and accessible (cached for _HEALTH_TTL seconds)."""
+        if self._health_check_is_fresh():
+            return
+        try:
+            # Try to list models to verify server is up
+            await self._get_async_client().list()
+        except Exception as e:
+            raise ConnectionError(f"Cannot connect to Ollama server: {str(e)}")
+        self._health_checked_at = time.monotonic()
+    
+    def _health_check_is_fresh(self) -> bool:
+        """Return whether the server passed a health check within the last _HEALTH_TTL seconds."""
+        return (
+            self._health_checked_at is not None
+            and time.monotonic() - self._health_checked_at < _HEALTH_TTL
+        )
     
     def _extract_json_from_response(self, response_text: str) -> str:
         """
@@ -100,24 +506,54 @@ class OllamaExtractor(AIExtractor):
         Returns:
             JSON string
         """
-        # Remove markdown code blocks if present
-        if '```json' in response_text:
-            start = response_text.find('```json') + 7
-            end = response_text.find('```', start)
-            if end != -1:
-                return response_text[start:end].strip()
-        elif '```' in response_text:
-            start = response_text.find('```') + 3
-            end = response_text.find('```', start)
-            if end != -1:
-                return response_text[start:end].strip()
-        
-        # Try to find JSON object boundaries
-        start = response_text.find('{')
-        end = response_text.rfind('}') + 1
-        
-        if start != -1 and end > start:
-            return response_text[start:end]
+        json_text = _find_json_object(response_text)
+        if json_text is not None:
+            return json_text
         
         return response_text.strip()
 
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Find the first top-level JSON object in text with a single scan.
+    
+    Surrounding text such as a markdown code fence is dropped and braces
+    inside JSON strings are ignored. If the object is never closed (e.g. truncated
+    output), everything up to the last closing brace is returned so the
+    JSON parser can report the error.
+    
+    Args:
+        text: Text that may contain a JSON object
+        
+    Returns:
+        JSON object text, or None if the text contains no braces
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape_end = 0
+    for token in _JSON_TOKEN_RE.finditer(text, start):
+        i = token.start()
+        if i < escape_end:
+            # Character following a backslash inside a string
+            continue
+        char = token.group()
+        if in_string:
+            if char == '\\':
+                escape_end = i + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    end = text.rfind('}') + 1
+    return text[start:end] if end > start else None
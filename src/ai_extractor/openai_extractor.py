@@ -1,27 +1,71 @@
 """OpenAI-based AI extractor."""
 
-import json
-from openai import OpenAI
-from typing import Dict, Any, Optional
-from .base import AIExtractor
+import logging
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, LengthFinishReasonError, OpenAI
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Type, TypeVar, Union
+from pydantic import BaseModel
+from .base import AIExtractor, DEFAULT_MAX_CHARS, HTTP_LIMITS, MAX_OUTPUT_TOKENS, PROMPT_VERSION
+from .schema import ResumeBatchExtraction, ResumeExtraction
+
+T = TypeVar("T", bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+# Most output tokens the chat models accept per request (gpt-4o, gpt-4o-mini);
+# larger max_completion_tokens values are rejected
+MAX_COMPLETION_TOKENS = 16384
+
+# Every request starts with the same instructions and schema; a shared cache
+# key routes them to the same servers so OpenAI's prompt caching can reuse
+# that prefix instead of recomputing it per resume
+_PROMPT_CACHE_KEY = f"resume-parser-{PROMPT_VERSION}"
 
 
 class OpenAIExtractor(AIExtractor):
-    """Extract information using OpenAI API."""
+    """
+    Extract information using OpenAI API.
+    
+    Requests use structured outputs, so the API guarantees that responses
+    conform to the resume schema and no JSON parsing or re-prompting is needed.
+    """
+    
+    provider = "openai"
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        map_reduce: bool = False,
+        semantic_cache: bool = False
+    ):
         """
         Initialize OpenAI extractor.
         
         Args:
             api_key: OpenAI API key (if None, reads from environment)
-            model: Model name (e.g., gpt-4, gpt-4o-mini, gpt-3.5-turbo)
+            model: Model name supporting structured outputs (e.g., gpt-4o-mini, gpt-4o)
+            cache_dir: Directory for cached extraction results (caching disabled if None)
+            max_chars: Maximum resume characters sent per request (unlimited if None)
+            map_reduce: Extract resumes longer than max_chars in chunks instead of truncating
+            semantic_cache: Also reuse results of near-duplicate resumes (requires cache_dir)
         """
+        super().__init__(
+            model=model,
+            cache_dir=cache_dir,
+            max_chars=max_chars,
+            map_reduce=map_reduce,
+            semantic_cache=semantic_cache
+        )
         self.api_key = api_key
-        self.model = model
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(
+            api_key=api_key,
+            http_client=DefaultHttpxClient(limits=HTTP_LIMITS)
+        )
     
-    def extract(self, resume_text: str) -> Dict[str, Any]:
+    def _extract_impl(self, resume_text: str) -> Dict[str, Any]:
         """
         Extract structured information using OpenAI.
         
@@ -33,38 +77,192 @@ class OpenAIExtractor(AIExtractor):
             
         Raises:
             ValueError: If API key is missing or extraction fails
-            Exception: For API errors
         """
+        self._check_api_key()
+        
+        messages = self._build_messages(self._get_extraction_prompt(resume_text))
+        
+        try:
+            parsed = self._parse(messages, ResumeExtraction)
+        except Exception as e:
+            raise ValueError(f"Error during OpenAI extraction: {str(e)}")
+        
+        return parsed.model_dump()
+    
+    async def _aextract_impl(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Asynchronously extract structured information using OpenAI.
+        
+        Args:
+            resume_text: Raw text extracted from PDF
+            
+        Returns:
+            Dictionary containing structured resume information
+            
+        Raises:
+            ValueError: If API key is missing or extraction fails
+        """
+        self._check_api_key()
+        
+        messages = self._build_messages(self._get_extraction_prompt(resume_text))
+        
+        try:
+            parsed = await self._aparse(messages, ResumeExtraction)
+        except Exception as e:
+            raise ValueError(f"Error during OpenAI extraction: {str(e)}")
+        
+        return parsed.model_dump()
+    
+    def _extract_batch_impl(self, resume_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extract several resumes with a single OpenAI request.
+        
+        Falls back to one request per resume if the combined request fails or
+        its response does not contain one result per resume.
+        
+        Args:
+            resume_texts: Raw texts extracted from the PDFs
+            
+        Returns:
+            One entry per text, in input order: the structured resume
+            information, or the exception raised while extracting that text
+            
+        Raises:
+            ValueError: If API key is missing
+        """
+        if len(resume_texts) < 2:
+            return super()._extract_batch_impl(resume_texts)
+        
+        self._check_api_key()
+        
+        messages = self._build_messages(self._get_batch_extraction_prompt(resume_texts))
+        
+        try:
+            parsed = self._parse(
+                messages,
+                ResumeBatchExtraction,
+                max_tokens=self._batch_output_tokens(len(resume_texts))
+            )
+        except Exception as e:
+            logger.warning(
+                "Combined OpenAI request for %d resumes failed, extracting them one by one: %s",
+                len(resume_texts), e
+            )
+            return super()._extract_batch_impl(resume_texts)
+        
+        if len(parsed.results) != len(resume_texts):
+            logger.warning(
+                "Combined OpenAI response has %d results for %d resumes, extracting them one by one",
+                len(parsed.results), len(resume_texts)
+            )
+            # Combined request was unusable; extract each resume on its own so
+            # one bad resume only fails itself
+            return super()._extract_batch_impl(resume_texts)
+        
+        return [result.model_dump() for result in parsed.results]
+    
+    def _batch_output_tokens(self, count: int) -> int:
+        """Return the output token budget of a combined request, within the model limit."""
+        return min(super()._batch_output_tokens(count), MAX_COMPLETION_TOKENS)
+    
+    def _check_api_key(self):
+        """Raise if no API key is configured."""
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
+    
+    def _parse(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Type[T],
+        max_tokens: int = MAX_OUTPUT_TOKENS
+    ) -> T:
+        """
+        Send a conversation and parse the structured response.
         
-        prompt = self._get_extraction_prompt(resume_text)
-        
+        Args:
+            messages: Chat messages (role/content dictionaries)
+            response_format: Pydantic model the response must conform to
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            Parsed response model
+            
+        Raises:
+            ValueError: If the model refuses the request or the output is cut
+                off by the max_tokens budget
+        """
         try:
-            response = self.client.chat.completions.create(
+            response = self.client.beta.chat.completions.parse(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a resume parser. Extract structured information from resumes and return valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},  # Force JSON mode
-                temperature=0.1  # Lower temperature for consistent output
+                messages=messages,
+                response_format=response_format,
+                temperature=0.1,  # Lower temperature for consistent output
+                top_p=0.1,
+                max_completion_tokens=max_tokens,
+                # Passed through extra_body so older SDK versions still send it
+                extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY}
             )
+        except LengthFinishReasonError:
+            raise ValueError(f"OpenAI output was cut off at the {max_tokens}-token limit")
+        return self._parsed_message(response)
+    
+    async def _aparse(
+        self,
+        messages: List[Dict[str, str]],
+        response_format: Type[T],
+        max_tokens: int = MAX_OUTPUT_TOKENS
+    ) -> T:
+        """
+        Asynchronously send a conversation and parse the structured response.
+        
+        Args:
+            messages: Chat messages (role/content dictionaries)
+            response_format: Pydantic model the response must conform to
+            max_tokens: Maximum number of tokens to generate
             
-            response_text = response.choices[0].message.content
+        Returns:
+            Parsed response model
+            
+        Raises:
+            ValueError: If the model refuses the request or the output is cut
+                off by the max_tokens budget
+        """
+        try:
+            response = await self._get_async_client().beta.chat.completions.parse(
+                model=self.model,
+                messages=messages,
+                response_format=response_format,
+                temperature=0.1,  # Lower temperature for consistent output
+                top_p=0.1,
+                max_completion_tokens=max_tokens,
+                # Passed through extra_body so older SDK versions still send it
+                extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY}
+            )
+        except LengthFinishReasonError:
+            raise ValueError(f"OpenAI output was cut off at the {max_tokens}-token limit")
+        return self._parsed_message(response)
+    
+    def _parsed_message(self, response: Any) -> Any:
+        """
+        Get the parsed model from a structured output response.
+        
+        Args:
+            response: Parsed chat completion
             
-            # Parse JSON response
-            parsed_data = json.loads(response_text)
-            return parsed_data
+        Returns:
+            Parsed response model
             
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse JSON from OpenAI response: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Error during OpenAI extraction: {str(e)}")
-
+        Raises:
+            ValueError: If the model refused to answer
+        """
+        message = response.choices[0].message
+        if message.parsed is None:
+            raise ValueError(f"OpenAI returned no structured output: {message.refusal or 'empty response'}")
+        return message.parsed
+    
+    def _create_async_client(self) -> AsyncOpenAI:
+        """Create an async OpenAI client with the configured API key."""
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=DefaultAsyncHttpxClient(limits=HTTP_LIMITS)
+        )
@@ -0,0 +1,141 @@
+"""Schemas for structured resume information returned by the models."""
+
+from typing import List
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaException
+from pydantic import BaseModel
+
+# Allowed values of the choice fields, mirroring the TextChoices in models.py
+GENDERS = ("male", "female", "other")
+ADDRESS_TYPES = ("present", "permanent")
+EDUCATION_LEVELS = (
+    "jsc", "ssc", "hsc", "o_level", "a_level", "bachelors", "masters", "phd",
+    "diploma", "ca_qualified", "ca_cc", "cma_qualified", "cma_student", "acca",
+    "cs", "mbbs", "bds", "llb", "llm", "other"
+)
+
+# Models often emit null for missing values; normalization turns them into
+# empty strings, so the schema only rejects structurally wrong output.
+_TEXT = {"type": ["string", "null"]}
+_TEXT_OR_NUMBER = {"type": ["string", "number", "null"]}
+
+
+def _object(properties: dict) -> dict:
+    return {"type": "object", "properties": properties}
+
+
+def _list_of(properties: dict) -> dict:
+    return {"type": ["array", "null"], "items": _object(properties)}
+
+
+RESUME_JSON_SCHEMA = _object({
+    "user_info": {
+        "type": ["object", "null"],
+        "properties": {
+            "name": _TEXT,
+            "date_of_birth": _TEXT,
+            "gender": _TEXT,
+            "email": _TEXT,
+            "phone_number": _TEXT_OR_NUMBER
+        }
+    },
+    "addresses": _list_of({
+        "type": _TEXT,
+        "address": _TEXT,
+        "post_name": _TEXT,
+        "post_code": _TEXT_OR_NUMBER
+    }),
+    "academic_education": _list_of({
+        "levels": _TEXT,
+        "subject": _TEXT,
+        "board": _TEXT,
+        "institute": _TEXT,
+        "passing_year": _TEXT_OR_NUMBER,
+        "result": _TEXT_OR_NUMBER
+    }),
+    "employment": _list_of({
+        "company_name": _TEXT,
+        "company_type": _TEXT,
+        "position": _TEXT,
+        "joining_date": _TEXT,
+        "leaving_date": _TEXT,
+        "currently_working": {"type": ["boolean", "string", "null"]},
+        "responsibility": _TEXT
+    }),
+    # Category mappings and {"name": ...} items are flattened by normalization
+    "skills": {
+        "type": ["array", "object", "null"],
+        "items": {"type": ["string", "object"]}
+    }
+})
+
+# Compiled once; validation is plain generated Python code afterwards
+validate_resume = fastjsonschema.compile(RESUME_JSON_SCHEMA)
+
+
+
+# Pydantic models mirroring models.py, used as OpenAI structured output
+# formats. Every field is required, as structured outputs demand; missing
+# values come back as empty strings.
+
+class UserInfoModel(BaseModel):
+    name: str
+    date_of_birth: str
+    gender: str
+    email: str
+    phone_number: str
+
+
+class AddressModel(BaseModel):
+    type: str
+    address: str
+    post_name: str
+    post_code: str
+
+
+class AcademicEducationModel(BaseModel):
+    levels: str
+    subject: str
+    board: str
+    institute: str
+    passing_year: str
+    result: str
+
+
+class EmploymentModel(BaseModel):
+    company_name: str
+    company_type: str
+    position: str
+    joining_date: str
+    leaving_date: str
+    currently_working: bool
+    responsibility: str
+
+
+class ResumeExtraction(BaseModel):
+    user_info: UserInfoModel
+    addresses: List[AddressModel]
+    academic_education: List[AcademicEducationModel]
+    employment: List[EmploymentModel]
+    skills: List[str]
+
+
+class ResumeBatchExtraction(BaseModel):
+    results: List[ResumeExtraction]
+
+
+__all__ = [
+    "GENDERS",
+    "ADDRESS_TYPES",
+    "EDUCATION_LEVELS",
+    "RESUME_JSON_SCHEMA",
+    "validate_resume",
+    "JsonSchemaException",
+    "UserInfoModel",
+    "AddressModel",
+    "AcademicEducationModel",
+    "EmploymentModel",
+    "ResumeExtraction",
+    "ResumeBatchExtraction"
+]
@@ -0,0 +1,232 @@
+"""Embedding-based cache reusing extraction results for near-duplicate resumes."""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.98
+
+# The embedding model only reads the first 256 word pieces of its input
+# (about 1,000 characters), so texts are embedded in chunks of this size and
+# the chunk embeddings averaged
+EMBED_CHUNK_CHARS = 1000
+
+# Bump whenever the way texts are embedded changes; files written by an
+# older version are then no longer read
+_STORE_VERSION = "v2"
+
+
+class SemanticCache:
+    """
+    Cache keyed by resume text embeddings.
+
+    Embeddings are stored as a float32 matrix in ``embeddings.v2.f32`` (read
+    through numpy.memmap) and results as aligned lines of ``results.v2.jsonl``.
+    A lookup is a single matrix product against all stored embeddings.
+    Before appending, both files are cut back to the rows they have in
+    common, so an interrupted write cannot shift later rows out of alignment.
+
+    Requires the optional ``numpy`` and ``sentence-transformers`` packages.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        threshold: float = DEFAULT_THRESHOLD,
+        model_name: str = DEFAULT_EMBEDDING_MODEL
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            cache_dir: Directory where embeddings and results are stored (created if missing)
+            threshold: Minimum cosine similarity for a cached result to be reused
+            model_name: sentence-transformers model used to embed resume text
+
+        Raises:
+            ImportError: If numpy or sentence-transformers is not installed
+        """
+        try:
+            import numpy
+            import sentence_transformers
+        except ImportError as e:
+            raise ImportError(
+                "The semantic cache requires numpy and sentence-transformers: "
+                "pip install numpy sentence-transformers"
+            ) from e
+
+        self._np = numpy
+        self._sentence_transformers = sentence_transformers
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.model_name = model_name
+
+        self._embeddings_path = self.cache_dir / f"embeddings.{_STORE_VERSION}.f32"
+        self._results_path = self.cache_dir / f"results.{_STORE_VERSION}.jsonl"
+        self._model = None
+        self._lock = threading.Lock()
+        # Byte offset just past each stored result line
+        self._result_ends: List[int] = []
+        self._results = self._load_results()
+        self._matrix = None
+        self._dim = None
+
+    def embed(self, texts: List[str]) -> Any:
+        """
+        Embed texts with the sentence-transformers model.
+
+        Each text is split into EMBED_CHUNK_CHARS-character chunks and the
+        chunk embeddings are averaged, so edits anywhere in a resume change
+        its embedding.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of unit-length embeddings, one row per text
+        """
+        np = self._np
+        chunks = []
+        owners = []
+        for i, text in enumerate(texts):
+            pieces = [text[start:start + EMBED_CHUNK_CHARS] for start in range(0, len(text), EMBED_CHUNK_CHARS)]
+            chunks.extend(pieces or [""])
+            owners.extend([i] * max(len(pieces), 1))
+
+        model = self._get_model()
+        vectors = np.asarray(
+            model.encode(chunks, batch_size=32, normalize_embeddings=True), dtype=np.float32
+        )
+        pooled = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+        np.add.at(pooled, owners, vectors)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.maximum(norms, 1e-12)
+
+    def lookup(self, embeddings: Any) -> List[Optional[Dict[str, Any]]]:
+        """
+        Find cached results for embeddings.
+
+        Args:
+            embeddings: Array of embeddings returned by embed
+
+        Returns:
+            For each embedding, the result of the most similar cached resume
+            if its similarity reaches the threshold, otherwise None
+        """
+        with self._lock:
+            matrix = self._get_matrix(embeddings.shape[1])
+            results = list(self._results)
+
+        if matrix is None or len(matrix) == 0:
+            return [None] * len(embeddings)
+
+        scores = embeddings @ matrix.T
+        best = scores.argmax(axis=1)
+        return [
+            results[index] if scores[row, index] >= self.threshold else None
+            for row, index in enumerate(best)
+        ]
+
+    def add(self, embeddings: Any, results: List[Dict[str, Any]]) -> None:
+        """
+        Store results for embedded resumes.
+
+        Write errors (e.g. a full or read-only cache directory) are logged
+        and otherwise ignored; the results are then simply not cached.
+
+        Args:
+            embeddings: Embedding rows returned by embed
+            results: Extraction result for each embedding
+        """
+        lines = [(json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8") for result in results]
+        rows = self._np.ascontiguousarray(embeddings, dtype=self._np.float32)
+
+        with self._lock:
+            self._matrix = None
+            try:
+                self._truncate_to_common_rows(rows.shape[1])
+                with open(self._results_path, "ab") as f:
+                    f.write(b"".join(lines))
+                with open(self._embeddings_path, "ab") as f:
+                    f.write(rows.tobytes())
+            except OSError as e:
+                logger.warning("Could not write semantic cache entries in %s: %s", self.cache_dir, e)
+                return
+            # Only recorded once both writes succeeded; otherwise the next
+            # add cuts the orphaned rows off again
+            end = self._result_ends[-1] if self._result_ends else 0
+            for line in lines:
+                end += len(line)
+                self._result_ends.append(end)
+            self._results.extend(results)
+
+    def _get_model(self):
+        """Load the embedding model on first use."""
+        with self._lock:
+            if self._model is None:
+                self._model = self._sentence_transformers.SentenceTransformer(self.model_name)
+            return self._model
+
+    def _get_matrix(self, dim: int):
+        """Return a memory map over the stored embeddings (caller holds the lock)."""
+        if self._matrix is not None and self._dim == dim:
+            return self._matrix
+        if not self._embeddings_path.exists():
+            return None
+
+        rows = min(self._embeddings_path.stat().st_size // (dim * 4), len(self._results))
+        if rows == 0:
+            return None
+
+        self._matrix = self._np.memmap(
+            self._embeddings_path, dtype=self._np.float32, mode="r", shape=(rows, dim)
+        )
+        self._dim = dim
+        return self._matrix
+
+    def _truncate_to_common_rows(self, dim: int) -> None:
+        """
+        Cut both files back to the rows present in each (caller holds the lock).
+
+        Args:
+            dim: Embedding dimension
+        """
+        row_bytes = dim * 4
+        try:
+            embedding_rows = self._embeddings_path.stat().st_size // row_bytes
+        except OSError:
+            embedding_rows = 0
+        rows = min(embedding_rows, len(self._results))
+
+        results_size = self._result_ends[rows - 1] if rows else 0
+        for path, size in ((self._results_path, results_size), (self._embeddings_path, rows * row_bytes)):
+            if path.exists() and path.stat().st_size != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        del self._results[rows:]
+        del self._result_ends[rows:]
+
+    def _load_results(self) -> List[Dict[str, Any]]:
+        """Read stored results up to the first partially written or invalid line."""
+        results = []
+        end = 0
+        try:
+            with open(self._results_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        results.append(json.loads(line))
+                    except ValueError:
+                        break
+                    end += len(line)
+                    self._result_ends.append(end)
+        except OSError:
+            pass
+        return results
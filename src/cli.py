@@ -1,11 +1,14 @@
 """Command-line interface for resume parser."""
 
-import json
+import asyncio
+import os
 import sys
 import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional
 
+from . import json_utils
 from .parser import ResumeParser
 
 
@@ -54,8 +57,21 @@ def cli():
     default=None,
     help="Ollama server URL (default: http://localhost:11434)"
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for cached extraction results (default: RESUME_CACHE_DIR env var, disabled if unset)"
+)
+@click.option(
+    "--semantic-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse results of near-duplicate resumes (requires a cache directory, numpy and sentence-transformers)"
+)
 def parse(pdf_file: Path, output: Optional[Path], format: str, provider: str, 
-          model: Optional[str], api_key: Optional[str], ollama_base_url: Optional[str]):
+          model: Optional[str], api_key: Optional[str], ollama_base_url: Optional[str],
+          cache_dir: Optional[Path], semantic_cache: bool):
     """Parse a single resume PDF file."""
     try:
         # Initialize parser
@@ -63,19 +79,15 @@ def parse(pdf_file: Path, output: Optional[Path], format: str, provider: str,
             provider=provider,
             model=model,
             api_key=api_key,
-            ollama_base_url=ollama_base_url
+            ollama_base_url=ollama_base_url,
+            cache_dir=str(cache_dir) if cache_dir else None,
+            semantic_cache=semantic_cache
         )
         
         # Parse the resume
         click.echo(f"Parsing resume: {pdf_file}", err=True)
         result = parser.parse(str(pdf_file))
         
-        # Format output
-        if format.lower() == "json":
-            output_text = json.dumps(result, indent=2, ensure_ascii=False)
-        else:
-            output_text = json.dumps(result, indent=2, ensure_ascii=False)
-        
         # Determine output file path
         if output:
             output_path = output
@@ -83,8 +95,8 @@ def parse(pdf_file: Path, output: Optional[Path], format: str, provider: str,
             # Auto-generate output filename based on input PDF
             output_path = pdf_file.parent / f"{pdf_file.stem}.json"
         
-        # Write output to file
-        output_path.write_text(output_text, encoding='utf-8')
+        # Write output to file (json is currently the only format)
+        json_utils.dump(result, output_path)
         click.echo(f"Results saved to: {output_path}", err=True)
         
     except FileNotFoundError as e:
@@ -139,11 +151,38 @@ def parse(pdf_file: Path, output: Optional[Path], format: str, provider: str,
     default=None,
     help="Ollama server URL (default: http://localhost:11434)"
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for cached extraction results (default: RESUME_CACHE_DIR env var, disabled if unset)"
+)
+@click.option(
+    "--semantic-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse results of near-duplicate resumes (requires a cache directory, numpy and sentence-transformers)"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    envvar="RESUME_WORKERS",
+    help="Number of batches parsed concurrently; up to workers x batch size resumes "
+         "are in flight (default: 8, env: RESUME_WORKERS)"
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Number of resumes sent to the model in one request (default: 4)"
+)
 def parse_batch(directory: Path, output: Optional[Path], format: str, provider: str,
-                model: Optional[str], api_key: Optional[str], ollama_base_url: Optional[str]):
+                model: Optional[str], api_key: Optional[str], ollama_base_url: Optional[str],
+                cache_dir: Optional[Path], semantic_cache: bool, workers: int, batch_size: int):
     """Parse multiple resume PDF files from a directory."""
     # Find all PDF files
-    pdf_files = list(directory.glob("*.pdf"))
+    pdf_files = _find_pdf_files(directory)
     
     if not pdf_files:
         click.echo(f"No PDF files found in directory: {directory}", err=True)
@@ -161,33 +200,155 @@ def parse_batch(directory: Path, output: Optional[Path], format: str, provider:
         provider=provider,
         model=model,
         api_key=api_key,
-        ollama_base_url=ollama_base_url
+        ollama_base_url=ollama_base_url,
+        cache_dir=str(cache_dir) if cache_dir else None,
+        semantic_cache=semantic_cache
     )
     
-    # Process each file
+    # Process batches concurrently; each call is dominated by LLM I/O
     successful = 0
     failed = 0
+    batches = [
+        pdf_files[start:start + batch_size]
+        for start in range(0, len(pdf_files), batch_size)
+    ]
     
-    for i, pdf_file in enumerate(pdf_files, 1):
-        try:
-            click.echo(f"[{i}/{len(pdf_files)}] Parsing: {pdf_file.name}", err=True)
-            result = parser.parse(str(pdf_file))
-            
-            # Generate output filename
-            output_filename = pdf_file.stem + ".json"
-            output_path = output_dir / output_filename
-            
-            # Format and save output
-            output_text = json.dumps(result, indent=2, ensure_ascii=False)
-            output_path.write_text(output_text, encoding='utf-8')
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(parser.parse_many, [str(p) for p in batch]): batch
+            for batch in batches
+        }
+        
+        i = 0
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [e] * len(batch)
             
+            for pdf_file, result in zip(batch, results):
+                i += 1
+                click.echo(f"[{i}/{len(pdf_files)}] Parsed: {pdf_file.name}", err=True)
+                if _save_result(pdf_file, result, output_dir):
+                    successful += 1
+                else:
+                    failed += 1
+    
+    # Summary
+    click.echo(f"\nProcessed {len(pdf_files)} files:", err=True)
+    click.echo(f"  Successful: {successful}", err=True)
+    click.echo(f"  Failed: {failed}", err=True)
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--output", "-o",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Output directory path (default: same as input directory)"
+)
+@click.option(
+    "--format",
+    type=click.Choice(["json"], case_sensitive=False),
+    default="json",
+    help="Output format (default: json)"
+)
+@click.option(
+    "--provider",
+    type=click.Choice(["ollama", "openai"], case_sensitive=False),
+    default="ollama",
+    help="AI provider (default: ollama)"
+)
+@click.option(
+    "--model",
+    type=str,
+    default=None,
+    help="Model name (default: llama3 for ollama, gpt-4o-mini for openai)"
+)
+@click.option(
+    "--api-key",
+    type=str,
+    default=None,
+    help="OpenAI API key (overrides environment variable)"
+)
+@click.option(
+    "--ollama-base-url",
+    type=str,
+    default=None,
+    help="Ollama server URL (default: http://localhost:11434)"
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory for cached extraction results (default: RESUME_CACHE_DIR env var, disabled if unset)"
+)
+@click.option(
+    "--semantic-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse results of near-duplicate resumes (requires a cache directory, numpy and sentence-transformers)"
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    help="Maximum number of resumes parsed at the same time (default: 16)"
+)
+def parse_batch_async(directory: Path, output: Optional[Path], format: str, provider: str,
+                      model: Optional[str], api_key: Optional[str], ollama_base_url: Optional[str],
+                      cache_dir: Optional[Path], semantic_cache: bool, concurrency: int):
+    """Parse multiple resume PDF files from a directory using asyncio."""
+    # Find all PDF files
+    pdf_files = _find_pdf_files(directory)
+    
+    if not pdf_files:
+        click.echo(f"No PDF files found in directory: {directory}", err=True)
+        sys.exit(1)
+    
+    # Determine output directory
+    if output is None:
+        output_dir = directory
+    else:
+        output_dir = output
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Initialize parser
+    parser = ResumeParser(
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        ollama_base_url=ollama_base_url,
+        cache_dir=str(cache_dir) if cache_dir else None,
+        semantic_cache=semantic_cache
+    )
+    
+    async def parse_all():
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded_parse(pdf_file: Path):
+            async with semaphore:
+                return await parser.aparse(str(pdf_file))
+        
+        return await asyncio.gather(
+            *[bounded_parse(pdf_file) for pdf_file in pdf_files],
+            return_exceptions=True
+        )
+    
+    click.echo(f"Parsing {len(pdf_files)} files (concurrency: {concurrency})", err=True)
+    results = asyncio.run(parse_all())
+    
+    successful = 0
+    failed = 0
+    
+    for i, (pdf_file, result) in enumerate(zip(pdf_files, results), 1):
+        click.echo(f"[{i}/{len(pdf_files)}] Parsed: {pdf_file.name}", err=True)
+        if _save_result(pdf_file, result, output_dir):
             successful += 1
-            click.echo(f"  ✓ Saved to: {output_path}", err=True)
-            
-        except Exception as e:
+        else:
             failed += 1
-            click.echo(f"  ✗ Failed: {str(e)}", err=True)
-            continue
     
     # Summary
     click.echo(f"\nProcessed {len(pdf_files)} files:", err=True)
@@ -195,6 +356,63 @@ def parse_batch(directory: Path, output: Optional[Path], format: str, provider:
     click.echo(f"  Failed: {failed}", err=True)
 
 
+def _find_pdf_files(directory: Path) -> List[Path]:
+    """
+    List the PDF files directly inside a directory.
+    
+    os.scandir returns the file type with each directory entry, so no extra
+    stat call is needed per file as with Path.glob.
+    
+    Args:
+        directory: Directory to search
+        
+    Returns:
+        Paths of the PDF files (case-insensitive .pdf suffix)
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        ]
+
+
+def _save_result(pdf_file: Path, result: Any, output_dir: Path) -> bool:
+    """
+    Write a parsed result to the output directory and report the outcome.
+    
+    Args:
+        pdf_file: Source PDF file
+        result: Structured resume information, or the exception raised for the file
+        output_dir: Directory receiving the JSON output
+        
+    Returns:
+        True if the result was saved, False if parsing or saving failed
+    """
+    if isinstance(result, BaseException) and not isinstance(result, Exception):
+        # e.g. a CancelledError collected by asyncio.gather; raising it here
+        # would abort the whole run instead of failing one file
+        click.echo(f"  ✗ Failed: {type(result).__name__}", err=True)
+        return False
+    
+    try:
+        if isinstance(result, Exception):
+            raise result
+        
+        # Generate output filename
+        output_filename = pdf_file.stem + ".json"
+        output_path = output_dir / output_filename
+        
+        # Format and save output
+        json_utils.dump(result, output_path)
+        
+        click.echo(f"  ✓ Saved to: {output_path}", err=True)
+        return True
+        
+    except Exception as e:
+        click.echo(f"  ✗ Failed: {str(e)}", err=True)
+        return False
+
+
 if __name__ == "__main__":
     cli()
 
@@ -0,0 +1,63 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of which backend parsed the document.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: JSON text or UTF-8 encoded bytes
+        
+    Returns:
+        Parsed Python object
+        
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object as indented UTF-8 encoded JSON.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dump(obj: Any, path: Union[str, Path]) -> None:
+    """
+    Write an object to a file as indented UTF-8 encoded JSON.
+    
+    The serialized bytes are written straight to a binary file, so the
+    document is never round-tripped through a Python str.
+    
+    Args:
+        obj: Object to serialize
+        path: Output file path
+    """
+    data = dumps(obj)
+    with open(path, "wb", buffering=64 * 1024) as f:
+        f.write(data)
@@ -1,10 +1,23 @@
 """Main resume parser orchestrator."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import os
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 
 from .pdf_extractor import PDFExtractor
 from .ai_extractor import AIExtractorFactory
+from .ai_extractor.base import DEFAULT_MAX_CHARS
+
+# Output fields in order; missing or null values become empty strings
+_USER_INFO_FIELDS = ("name", "date_of_birth", "gender", "email", "phone_number")
+_ADDRESS_FIELDS = ("type", "address", "post_name", "post_code")
+_EDUCATION_FIELDS = ("levels", "subject", "board", "institute", "passing_year", "result")
+_EMPLOYMENT_FIELDS = (
+    "company_name", "company_type", "position", "joining_date",
+    "leaving_date", "currently_working", "responsibility"
+)
+_TRUE_STRINGS = frozenset({"yes", "true", "1"})
 
 
 class ResumeParser:
@@ -15,7 +28,11 @@ class ResumeParser:
         provider: str = "ollama",
         model: Optional[str] = None,
         api_key: Optional[str] = None,
-        ollama_base_url: Optional[str] = None
+        ollama_base_url: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        map_reduce: bool = False,
+        semantic_cache: bool = False
     ):
         """
         Initialize the resume parser.
@@ -25,13 +42,27 @@ class ResumeParser:
             model: Model name (provider-specific)
             api_key: OpenAI API key (only needed for OpenAI provider)
             ollama_base_url: Ollama server base URL
+            cache_dir: Directory for cached PDF text and extraction results (optional)
+            max_chars: Maximum resume characters sent per request (unlimited if None)
+            map_reduce: Extract resumes longer than max_chars in chunks instead of truncating
+            semantic_cache: Also reuse results of near-duplicate resumes (requires cache_dir)
         """
-        self.pdf_extractor = PDFExtractor()
+        # Same fallback as the AI extractor cache
+        self.pdf_extractor = PDFExtractor(
+            cache_dir=cache_dir or os.getenv("RESUME_CACHE_DIR"),
+            # Pages beyond what the model will see are not worth reading;
+            # map-reduce extraction needs the whole document
+            max_chars=None if map_reduce else max_chars
+        )
         self.ai_extractor = AIExtractorFactory.create(
             provider=provider,
             model=model,
             api_key=api_key,
-            ollama_base_url=ollama_base_url
+            ollama_base_url=ollama_base_url,
+            cache_dir=cache_dir,
+            max_chars=max_chars,
+            map_reduce=map_reduce,
+            semantic_cache=semantic_cache
         )
     
     def parse(self, pdf_path: str) -> Dict[str, Any]:
@@ -49,6 +80,119 @@ class ResumeParser:
             ValueError: If PDF extraction or AI extraction fails
             PermissionError: If PDF is password-protected
         """
+        resume_text = self._extract_resume_text(pdf_path)
+        
+        # Extract structured information using AI
+        try:
+            structured_data = self.ai_extractor.extract(resume_text)
+        except Exception as e:
+            raise ValueError(f"Failed to extract information using AI: {str(e)}")
+        
+        # Validate and normalize the output structure
+        normalized_data = self._normalize_output(structured_data)
+        
+        return normalized_data
+    
+    async def aparse(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Asynchronously parse a resume PDF and extract structured information.
+        
+        PDF text extraction runs in the default executor so that many resumes
+        can be awaited concurrently. When the AI extractor has no cache, every
+        resume reaches the model, so the extractor warms up meanwhile (e.g.
+        Ollama loads the model) and the first request does not pay for it.
+        With a cache there is no warm-up, since it could not overlap with
+        anything but a cache lookup.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Dictionary containing structured resume information
+            
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ValueError: If PDF extraction or AI extraction fails
+        """
+        loop = asyncio.get_running_loop()
+        text_future = loop.run_in_executor(None, self._extract_resume_text, pdf_path)
+        if self.ai_extractor.cache is None and self.ai_extractor.semantic_cache is None:
+            # Shared by all concurrent calls; aextract awaits it
+            self.ai_extractor.start_warm_up()
+        resume_text = await text_future
+        
+        # Extract structured information using AI
+        try:
+            structured_data = await self.ai_extractor.aextract(resume_text)
+        except Exception as e:
+            raise ValueError(f"Failed to extract information using AI: {str(e)}")
+        
+        return self._normalize_output(structured_data)
+    
+    def parse_many(self, pdf_paths: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Parse several resume PDFs, sending their text to the AI extractor in one batch.
+        
+        Text extraction of the PDFs runs in parallel across processes when
+        more than one CPU is available.
+        
+        Failures are isolated per file: a PDF that cannot be read does not
+        prevent the others from being parsed.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            
+        Returns:
+            One entry per path, in input order: the structured resume
+            information, or the exception raised while parsing that file
+        """
+        results: List[Union[Dict[str, Any], Exception, None]] = [None] * len(pdf_paths)
+        resume_texts = []
+        indices = []
+        
+        # PDFs are read in parallel worker processes where possible
+        extracted = self.pdf_extractor.extract_texts(pdf_paths)
+        for i, (pdf_path, text) in enumerate(zip(pdf_paths, extracted)):
+            try:
+                if isinstance(text, FileNotFoundError):
+                    raise text
+                if isinstance(text, Exception):
+                    raise ValueError(f"Failed to extract text from PDF: {str(text)}")
+                resume_texts.append(self._check_resume_text(pdf_path, text))
+                indices.append(i)
+            except Exception as e:
+                results[i] = e
+        
+        if resume_texts:
+            try:
+                structured_data = self.ai_extractor.extract_batch(resume_texts)
+            except Exception as e:
+                error = ValueError(f"Failed to extract information using AI: {str(e)}")
+                for i in indices:
+                    results[i] = error
+            else:
+                for i, data in zip(indices, structured_data):
+                    if isinstance(data, Exception):
+                        results[i] = ValueError(f"Failed to extract information using AI: {str(data)}")
+                    else:
+                        results[i] = self._normalize_output(data)
+        
+        return results
+    
+    def _extract_resume_text(self, pdf_path: str) -> str:
+        """
+        Extract and validate the text of a resume PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Extracted resume text
+            
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ValueError: If PDF extraction fails or yields too little text
+        """
         # Validate PDF file
         if not Path(pdf_path).exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
@@ -59,20 +203,27 @@ class ResumeParser:
         except Exception as e:
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
         
+        return self._check_resume_text(pdf_path, resume_text)
+    
+    def _check_resume_text(self, pdf_path: str, resume_text: str) -> str:
+        """
+        Check that enough text was extracted from a resume PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            resume_text: Text extracted from the PDF
+            
+        Returns:
+            The resume text
+            
+        Raises:
+            ValueError: If the text is too short to be a resume
+        """
         # Validate that we got some text
         if not resume_text or len(resume_text.strip()) < 10:
             raise ValueError(f"Insufficient text extracted from PDF: {pdf_path}")
         
-        # Extract structured information using AI
-        try:
-            structured_data = self.ai_extractor.extract(resume_text)
-        except Exception as e:
-            raise ValueError(f"Failed to extract information using AI: {str(e)}")
-        
-        # Validate and normalize the output structure
-        normalized_data = self._normalize_output(structured_data)
-        
-        return normalized_data
+        return resume_text
     
     def _normalize_output(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -97,66 +248,23 @@ class ResumeParser:
     def _normalize_user_info(self, user_info: Any) -> Dict[str, str]:
         if not isinstance(user_info, dict):
             user_info = {}
-        return {
-            "name": user_info.get("name", "") or "",
-            "date_of_birth": user_info.get("date_of_birth", "") or "",
-            "gender": user_info.get("gender", "") or "",
-            "email": user_info.get("email", "") or "",
-            "phone_number": user_info.get("phone_number", "") or ""
-        }
+        get = user_info.get
+        return {field: get(field) or "" for field in _USER_INFO_FIELDS}
 
     def _normalize_addresses(self, addresses: Any) -> list:
         if not isinstance(addresses, list):
-            addresses = []
-        normalized_addresses = []
-        for address in addresses:
-            if not isinstance(address, dict):
-                continue
-            normalized_addresses.append({
-                "type": (address.get("type") or "").lower(),
-                "address": address.get("address", "") or "",
-                "post_name": address.get("post_name", "") or "",
-                "post_code": address.get("post_code", "") or ""
-            })
-        return normalized_addresses
+            return []
+        return [_normalize_address(address) for address in addresses if isinstance(address, dict)]
 
     def _normalize_academic_education(self, entries: Any) -> list:
         if not isinstance(entries, list):
-            entries = []
-        normalized_entries = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            normalized_entries.append({
-                "levels": (entry.get("levels") or "").lower(),
-                "subject": entry.get("subject", "") or "",
-                "board": entry.get("board", "") or "",
-                "institute": entry.get("institute", "") or "",
-                "passing_year": entry.get("passing_year", "") or "",
-                "result": entry.get("result", "") or ""
-            })
-        return normalized_entries
+            return []
+        return [_normalize_education_entry(entry) for entry in entries if isinstance(entry, dict)]
 
     def _normalize_employment(self, entries: Any) -> list:
         if not isinstance(entries, list):
-            entries = []
-        normalized_entries = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            currently_working = entry.get("currently_working", False)
-            if isinstance(currently_working, str):
-                currently_working = currently_working.strip().lower() in {"yes", "true", "1"}
-            normalized_entries.append({
-                "company_name": entry.get("company_name", "") or "",
-                "company_type": entry.get("company_type", "") or "",
-                "position": entry.get("position", "") or "",
-                "joining_date": entry.get("joining_date", "") or "",
-                "leaving_date": entry.get("leaving_date", "") or "",
-                "currently_working": bool(currently_working),
-                "responsibility": entry.get("responsibility", "") or ""
-            })
-        return normalized_entries
+            return []
+        return [_normalize_employment_entry(entry) for entry in entries if isinstance(entry, dict)]
 
     def _normalize_skills(self, skills: Any) -> list:
         if isinstance(skills, dict):
@@ -169,10 +277,44 @@ class ResumeParser:
         if not isinstance(skills, list):
             skills = []
         normalized_skills = []
+        seen = set()
         for skill in skills:
             if isinstance(skill, str):
-                normalized_skills.append(skill.strip())
+                skill = skill.strip()
             elif isinstance(skill, dict) and "name" in skill:
-                normalized_skills.append(str(skill.get("name") or "").strip())
-        return [s for s in normalized_skills if s]
+                skill = str(skill.get("name") or "").strip()
+            else:
+                continue
+            # Category flattening often repeats a skill; keep the first spelling
+            key = skill.casefold()
+            if skill and key not in seen:
+                seen.add(key)
+                normalized_skills.append(skill)
+        return normalized_skills
+
+
+# Per-entry normalizers are module functions so the list comprehensions above
+# call them directly instead of through a bound method per entry
+
+def _normalize_address(address: Dict[str, Any]) -> Dict[str, Any]:
+    get = address.get
+    normalized = {field: get(field) or "" for field in _ADDRESS_FIELDS}
+    normalized["type"] = (get("type") or "").lower()
+    return normalized
+
+
+def _normalize_education_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    get = entry.get
+    normalized = {field: get(field) or "" for field in _EDUCATION_FIELDS}
+    normalized["levels"] = (get("levels") or "").lower()
+    return normalized
+
 
+def _normalize_employment_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    get = entry.get
+    currently_working = get("currently_working", False)
+    if isinstance(currently_working, str):
+        currently_working = currently_working.strip().lower() in _TRUE_STRINGS
+    normalized = {field: get(field) or "" for field in _EMPLOYMENT_FIELDS}
+    normalized["currently_working"] = bool(currently_working)
+    return normalized
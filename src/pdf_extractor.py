@@ -1,15 +1,89 @@
 """PDF text extraction module."""
 
-import pdfplumber
+import hashlib
+import importlib.util
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain, islice
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from . import text_clean
+from .pdf_text_cache import PDFTextCache
+
+logger = logging.getLogger(__name__)
+
+# pdfplumber and PyMuPDF take a noticeable time to import, so they are only
+# imported when a PDF is first read. PyMuPDF is AGPL-licensed and changes
+# the extracted text, so it is only used when RESUME_USE_PYMUPDF is set,
+# never merely because it happens to be installed
+USE_PYMUPDF = os.getenv("RESUME_USE_PYMUPDF", "").lower() in ("1", "true", "yes")
+if USE_PYMUPDF and importlib.util.find_spec("pymupdf") is None:
+    logger.warning("RESUME_USE_PYMUPDF is set but PyMuPDF is not installed; using pdfplumber")
+    USE_PYMUPDF = False
+
+# Bump when a change to extraction or cleaning alters the text produced,
+# so cached text from older versions is not reused; the backends produce
+# slightly different text, so each gets its own entries
+TEXT_VERSION = "v1-pymupdf" if USE_PYMUPDF else "v1-pdfplumber"
+
+# Pages yielding fewer characters than SPARSE_PAGE_CHARS are treated as
+# scanned images; after SPARSE_PAGE_LIMIT of them in a row following some
+# text, the remaining pages are skipped
+SPARSE_PAGE_CHARS = 20
+SPARSE_PAGE_LIMIT = 2
+
+# Number of leading pages probed for a text layer; a PDF is only rejected as
+# scanned if none of them has text, so an image-only cover or photo page
+# before the text pages is fine
+SCAN_PROBE_PAGES = 3
+
+# PDFs with at least this many pages have their pages extracted in worker
+# processes; below it the pool overhead outweighs the gain
+PARALLEL_PAGE_THRESHOLD = 4
+
+# Most pages handed to a worker in one task. Each task re-opens the
+# document, but smaller tasks let extraction stop early once enough text
+# has been read
+MAX_PAGES_PER_TASK = 8
+
+# Runs of horizontal whitespace, collapsed by the Python text cleanup
+_HSPACE = re.compile(r'[ \t]+')
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+_in_worker = False
+
+
+class ScannedPDFError(ValueError):
+    """Raised for image-only PDFs, whose text needs OCR to be extracted."""
 
 
 class PDFExtractor:
     """Extracts text content from PDF files."""
     
-    def __init__(self):
-        """Initialize the PDF extractor."""
-        pass
+    def __init__(self, cache_dir: Optional[str] = None, max_chars: Optional[int] = None):
+        """
+        Initialize the PDF extractor.
+        
+        Args:
+            cache_dir: Directory for cached PDF text, keyed by a hash of the
+                file contents (optional, caching disabled if None)
+            max_chars: Stop reading pages once this many characters have been
+                extracted (all pages are read if None)
+        """
+        self.cache = PDFTextCache(cache_dir) if cache_dir else None
+        self.max_chars = max_chars
+        # Cached text depends on the page limit as well as the extraction code
+        self._cache_version = TEXT_VERSION if max_chars is None else f"{TEXT_VERSION}:{max_chars}"
     
     def extract_text(self, pdf_path: str) -> str:
         """
@@ -24,8 +98,92 @@ class PDFExtractor:
         Raises:
             FileNotFoundError: If the PDF file doesn't exist
             ValueError: If the file is not a PDF or is corrupted
+            ScannedPDFError: If the PDF is a scan without a text layer (a ValueError)
             PermissionError: If the PDF is password-protected
         """
+        self._check_path(pdf_path)
+        
+        # The file is mapped once and the mapping serves both the cache key
+        # and pdfplumber, so the bytes are not read twice
+        digest = None
+        with _map_file(pdf_path) as mapped:
+            if self.cache is not None and mapped is not None:
+                digest = hashlib.blake2b(mapped, digest_size=32).digest()
+                cached = self.cache.get(digest, self._cache_version)
+                if cached is not None:
+                    return cached
+            
+            text = self._extract_uncached(pdf_path, mapped)
+        
+        if digest is not None:
+            self.cache.put(digest, self._cache_version, text)
+        return text
+    
+    def extract_texts(self, pdf_paths: List[str]) -> List[Union[str, Exception]]:
+        """
+        Extract text from several PDF files.
+        
+        Files missing from the cache are extracted in parallel by the shared
+        process pool when more than one CPU is available. Failures are
+        isolated per file; if the pool breaks (e.g. a worker is killed),
+        the affected files are extracted in this process instead.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            
+        Returns:
+            One entry per path, in input order: the extracted text, or the
+            exception raised for that file (as raised by extract_text)
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(pdf_paths)
+        digests: Dict[int, bytes] = {}
+        pending = []
+        for i, pdf_path in enumerate(pdf_paths):
+            try:
+                self._check_path(pdf_path)
+                if self.cache is not None:
+                    digest = _hash_file(pdf_path)
+                    if digest is not None:
+                        cached = self.cache.get(digest, self._cache_version)
+                        if cached is not None:
+                            results[i] = cached
+                            continue
+                        digests[i] = digest
+                pending.append(i)
+            except Exception as e:
+                results[i] = e
+        
+        pool = None
+        futures: Dict[int, Optional[Future]] = {}
+        if len(pending) > 1 and _pool_available():
+            pool = _get_page_pool()
+            futures = {i: _submit(pool, _extract_document, pdf_paths[i], self.max_chars) for i in pending}
+        
+        for i in pending:
+            try:
+                text = _pool_result(pool, futures.get(i))
+                if text is None:
+                    text = self._extract_uncached(pdf_paths[i])
+            except Exception as e:
+                results[i] = e
+                continue
+            results[i] = text
+            if i in digests:
+                self.cache.put(digests[i], self._cache_version, text)
+        
+        return results
+    
+    def _check_path(self, pdf_path: str) -> None:
+        """
+        Check that a path names an existing PDF file.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Raises:
+            FileNotFoundError: If the PDF file doesn't exist
+            ValueError: If the file is not a PDF
+        """
         pdf_path_obj = Path(pdf_path)
         
         if not pdf_path_obj.exists():
@@ -33,33 +191,48 @@ class PDFExtractor:
         
         if not pdf_path_obj.suffix.lower() == '.pdf':
             raise ValueError(f"File is not a PDF: {pdf_path}")
+    
+    def _extract_uncached(self, pdf_path: str, mapped: Optional[mmap.mmap] = None) -> str:
+        """
+        Extract and clean the text of a PDF file.
         
-        try:
-            text_content = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-            
-            if not text_content:
-                raise ValueError(f"No text could be extracted from PDF: {pdf_path}")
-            
-            # Join all pages with newlines
-            full_text = "\n\n".join(text_content)
-            
-            # Clean up excessive whitespace while preserving structure
-            cleaned_text = self._clean_text(full_text)
+        PyMuPDF is used when enabled with RESUME_USE_PYMUPDF, with
+        pdfplumber as the fallback for documents it finds no text in.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            mapped: Memory map of the file, read by pdfplumber instead of the path
             
-            return cleaned_text
+        Returns:
+            Extracted text content
             
-        except pdfplumber.PDFException as e:
-            raise ValueError(f"Error reading PDF file: {str(e)}")
+        Raises:
+            ValueError: If the file is corrupted or contains no text
+            ScannedPDFError: If the PDF is a scan without a text layer
+            PermissionError: If the PDF is password-protected
+        """
+        try:
+            page_texts = _extract_page_texts_pymupdf(pdf_path, self.max_chars) if USE_PYMUPDF else []
+            if not any(text.strip() for text in page_texts):
+                # PyMuPDF not enabled or found no text layer; try pdfplumber
+                page_texts = _extract_page_texts(pdf_path, self.max_chars, mapped)
+        except (PermissionError, ScannedPDFError):
+            raise
         except Exception as e:
             # Check if it's a password-protected PDF
             if "password" in str(e).lower() or "encrypted" in str(e).lower():
                 raise PermissionError(f"PDF is password-protected: {pdf_path}")
-            raise ValueError(f"Unexpected error extracting PDF: {str(e)}")
+            raise ValueError(f"Error reading PDF file: {str(e)}")
+        
+        text_content = [text for text in page_texts if text]
+        if not text_content:
+            raise ValueError(f"No text could be extracted from PDF: {pdf_path}")
+        
+        # Join all pages with newlines
+        full_text = "\n\n".join(text_content)
+        
+        # Clean up excessive whitespace while preserving structure
+        return self._clean_text(full_text)
     
     def _clean_text(self, text: str) -> str:
         """
@@ -71,23 +244,364 @@ class PDFExtractor:
         Returns:
             Cleaned text
         """
-        # Replace multiple newlines with double newline
-        import re
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        # Replace multiple spaces with single space (but preserve newlines)
-        text = re.sub(r'[ \t]+', ' ', text)
-        # Remove leading/trailing whitespace from each line
-        lines = [line.strip() for line in text.split('\n')]
-        # Remove empty lines but preserve paragraph breaks
-        cleaned_lines = []
-        prev_empty = False
-        for line in lines:
-            if line:
-                cleaned_lines.append(line)
-                prev_empty = False
-            elif not prev_empty:
-                cleaned_lines.append('')
-                prev_empty = True
-        
-        return '\n'.join(cleaned_lines).strip()
+        cleaned = text_clean.clean_text(text)
+        if cleaned is not None:
+            return cleaned
+        return _clean_text_python(text)
+
+
+def _clean_text_python(text: str) -> str:
+    """
+    Clean extracted text in Python; text_clean.clean_text must match it.
+    
+    Args:
+        text: Raw extracted text
+        
+    Returns:
+        Cleaned text
+    """
+    # Replace multiple spaces with single space (but preserve newlines)
+    text = _HSPACE.sub(' ', text)
+    # Strip each line and collapse runs of empty lines into a single
+    # paragraph break, in one pass over the lines
+    cleaned_lines = []
+    prev_empty = False
+    for line in text.split('\n'):
+        line = line.strip()
+        if line:
+            cleaned_lines.append(line)
+            prev_empty = False
+        elif not prev_empty:
+            cleaned_lines.append('')
+            prev_empty = True
+    
+    return '\n'.join(cleaned_lines).strip()
+
+
+def _extract_page_texts_pymupdf(pdf_path: str, max_chars: Optional[int] = None) -> List[str]:
+    """
+    Extract the text of the pages of a PDF with PyMuPDF, in page order.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        max_chars: Character budget after which remaining pages are skipped
+        
+    Returns:
+        Text of each page read
+        
+    Raises:
+        PermissionError: If the PDF is password-protected
+        ScannedPDFError: If the first pages are images without text
+    """
+    import pymupdf
+    
+    # PyMuPDF's default text flags without TEXT_PRESERVE_LIGATURES, so ligatures
+    # such as "ﬁ" come out as plain letters like pdfplumber produces them
+    flags = pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_MEDIABOX_CLIP
+    with pymupdf.open(pdf_path) as doc:
+        if doc.needs_pass:
+            raise PermissionError(f"PDF is password-protected: {pdf_path}")
+        if doc.page_count == 0:
+            return []
+        
+        probed = min(SCAN_PROBE_PAGES, doc.page_count)
+        probe_texts = [doc[i].get_text("text", flags=flags) for i in range(probed)]
+        _check_not_scanned(probe_texts, lambda: any(doc[i].get_images() for i in range(probed)), pdf_path)
+        return _take_pages(
+            chain(probe_texts, (doc[i].get_text("text", flags=flags) for i in range(probed, doc.page_count))),
+            max_chars,
+            pdf_path
+        )
+
+
+def _extract_page_texts(
+    pdf_path: str,
+    max_chars: Optional[int] = None,
+    stream: Optional[mmap.mmap] = None
+) -> List[Optional[str]]:
+    """
+    Extract the text of the pages of a PDF with pdfplumber, in page order.
+    
+    Long PDFs are split into contiguous page ranges extracted in parallel by
+    a shared process pool, since pdfminer's layout analysis is CPU-bound.
+    Ranges are submitted as earlier ones are consumed, so no further ranges
+    are started once max_chars is reached.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        max_chars: Character budget after which remaining pages are skipped
+        stream: Memory map of the file to parse instead of opening the path
+            (worker processes always open the path)
+        
+    Returns:
+        Text of each page read (None for pages without text)
+        
+    Raises:
+        ScannedPDFError: If the first pages are images without text
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(stream if stream is not None else pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        if page_count == 0:
+            return []
+        
+        probe_pages = pdf.pages[:SCAN_PROBE_PAGES]
+        probe_texts = [page.extract_text() for page in probe_pages]
+        _check_not_scanned(probe_texts, lambda: any(page.images for page in probe_pages), pdf_path)
+        
+        workers = os.cpu_count() or 1
+        remaining = page_count - len(probe_texts)
+        if remaining < 1 or page_count < PARALLEL_PAGE_THRESHOLD or not _pool_available():
+            rest = (page.extract_text() for page in pdf.pages[len(probe_texts):])
+            return _take_pages(chain(probe_texts, rest), max_chars, pdf_path)
+    
+    # Re-opening the document costs a full parse, so each worker gets a
+    # range of the remaining pages rather than a single page
+    first = len(probe_texts) + 1
+    chunk_size = min(-(-remaining // workers), MAX_PAGES_PER_TASK)
+    chunks = [
+        list(range(first + start, first + min(start + chunk_size, remaining)))
+        for start in range(0, remaining, chunk_size)
+    ]
+    rest = _iter_pages_parallel(pdf_path, chunks, workers)
+    try:
+        return _take_pages(chain(probe_texts, rest), max_chars, pdf_path)
+    finally:
+        # Cancels the ranges still queued when reading stopped early
+        rest.close()
+
+
+def _iter_pages_parallel(pdf_path: str, chunks: List[List[int]], in_flight: int) -> Iterator[Optional[str]]:
+    """
+    Extract page ranges in the process pool, yielding page texts in order.
+    
+    At most in_flight ranges are submitted at a time; the next one is only
+    submitted after the texts of an earlier one have been consumed.
+    Closing the iterator cancels the ranges not yet started. Ranges the
+    pool cannot run because it broke are extracted in this process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        chunks: 1-based page numbers of each range, in page order
+        in_flight: Maximum number of ranges submitted at once
+        
+    Yields:
+        Text of each page (None for pages without text)
+    """
+    pool = _get_page_pool()
+    chunks_iter = iter(chunks)
+    pending = deque(
+        (chunk, _submit(pool, _extract_pages, pdf_path, chunk))
+        for chunk in islice(chunks_iter, in_flight)
+    )
+    try:
+        while pending:
+            chunk, future = pending.popleft()
+            texts = _pool_result(pool, future)
+            yield from texts if texts is not None else _extract_pages(pdf_path, chunk)
+            chunk = next(chunks_iter, None)
+            if chunk is not None:
+                pending.append((chunk, _submit(pool, _extract_pages, pdf_path, chunk)))
+    finally:
+        for _, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+def _check_not_scanned(probe_texts: List[Optional[str]], has_images: Callable[[], bool], pdf_path: str) -> None:
+    """
+    Fail fast on PDFs whose first pages are images without a text layer.
+    
+    Such documents are scanned; reading the remaining pages would only cost
+    time before failing for lack of text.
+    
+    Args:
+        probe_texts: Text extracted from the first SCAN_PROBE_PAGES pages
+        has_images: Returns whether the probed pages contain images (only
+            called when none of them has text)
+        pdf_path: Path to the PDF file, for the error message
+        
+    Raises:
+        ScannedPDFError: If none of the probed pages has text but they contain images
+    """
+    if not any(text and text.strip() for text in probe_texts) and has_images():
+        raise ScannedPDFError(f"PDF appears to be scanned (no text layer), OCR is required: {pdf_path}")
+
+
+def _take_pages(page_texts: Iterator[Optional[str]], max_chars: Optional[int], pdf_path: str) -> List[Optional[str]]:
+    """
+    Consume page texts until enough text has been captured.
+    
+    Reading stops once max_chars characters have been collected, or when
+    SPARSE_PAGE_LIMIT consecutive pages after some text has been found have
+    almost none (scanned trailing pages such as certificates or appendices).
+    
+    Args:
+        page_texts: Lazily extracted text of each page, in page order
+        max_chars: Character budget (unlimited if None)
+        pdf_path: Path to the PDF file, for logging
+        
+    Returns:
+        Text of each page read
+    """
+    taken: List[Optional[str]] = []
+    total_chars = 0
+    sparse_pages = 0
+    for text in page_texts:
+        taken.append(text)
+        length = len(text.strip()) if text else 0
+        total_chars += length
+        sparse_pages = sparse_pages + 1 if total_chars and length < SPARSE_PAGE_CHARS else 0
+        
+        if max_chars is not None and total_chars >= max_chars:
+            reason = f"reached {max_chars} characters"
+        elif sparse_pages >= SPARSE_PAGE_LIMIT:
+            reason = f"{sparse_pages} consecutive pages without text"
+        else:
+            continue
+        
+        logger.info("Stopped reading %s after page %d: %s", pdf_path, len(taken), reason)
+        break
+    
+    return taken
+
+
+def _extract_pages(pdf_path: str, page_numbers: List[int]) -> List[Optional[str]]:
+    """
+    Extract the text of selected pages; runs in a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based numbers of the pages to extract
+        
+    Returns:
+        Text of each selected page (None for pages without text)
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        return [page.extract_text() for page in pdf.pages]
+
+
+def _extract_document(pdf_path: str, max_chars: Optional[int]) -> str:
+    """
+    Extract and clean the text of a whole PDF; runs in a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        max_chars: Character budget after which remaining pages are skipped
+        
+    Returns:
+        Extracted text content
+    """
+    return PDFExtractor(max_chars=max_chars)._extract_uncached(pdf_path)
+
+
+def _hash_file(path: str) -> Optional[bytes]:
+    """
+    Hash the contents of a file through a memory map.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        BLAKE2b digest of the contents, or None if the file is empty
+    """
+    with _map_file(path) as mapped:
+        return hashlib.blake2b(mapped, digest_size=32).digest() if mapped is not None else None
+
+
+@contextmanager
+def _map_file(path: str) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Memory-map a file for reading.
+    
+    Args:
+        path: Path to the file
+        
+    Yields:
+        Read-only memory map of the file, or None if it is empty and cannot be mapped
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mapped = None
+        
+        if mapped is None:
+            yield None
+            return
+        with mapped:
+            yield mapped
+
+
+def _pool_available() -> bool:
+    """Return whether work can be spread over the process pool."""
+    # Workers never start a pool of their own
+    return not _in_worker and (os.cpu_count() or 1) > 1
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the process pool for PDF extraction, creating it on first use."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            # The pool is first used from worker threads (parse-batch, the
+            # asyncio default executor), and forking a multi-threaded
+            # process can deadlock the child, so workers are never forked
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _page_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker
+            )
+        return _page_pool
+
+
+def _submit(pool: ProcessPoolExecutor, fn: Callable, *args: Any) -> Optional[Future]:
+    """
+    Submit work to the process pool.
+    
+    Returns:
+        Future of the call, or None if the pool is broken (it is then discarded)
+    """
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _discard_page_pool(pool)
+        return None
+
+
+def _pool_result(pool: Optional[ProcessPoolExecutor], future: Optional[Future]) -> Any:
+    """
+    Wait for work submitted with _submit.
+    
+    Returns:
+        Result of the call, or None if it was not submitted or the pool broke
+        while running it (the pool is then discarded)
+    """
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _discard_page_pool(pool)
+        return None
+
+
+def _discard_page_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken process pool so the next caller starts a new one."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not pool:
+            return
+        _page_pool = None
+    logger.warning("PDF extraction worker pool broke; extracting in-process until a new pool starts")
+    pool.shutdown(wait=False)
+
 
+def _init_worker() -> None:
+    """Mark the current process as a pool worker."""
+    global _in_worker
+    _in_worker = True
@@ -0,0 +1,69 @@
+"""On-disk cache for text extracted from PDF files."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+
+class PDFTextCache:
+    """SQLite cache mapping a hash of the PDF bytes to its cleaned text."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the PDF text cache.
+
+        Args:
+            cache_dir: Directory holding the ``pdf_text.db`` database (created if missing)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # One connection shared by all threads, serialized by the lock;
+        # WAL lets other processes read while an entry is written
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "pdf_text.db"),
+            timeout=30.0,
+            check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_text ("
+                "hash BLOB PRIMARY KEY, version TEXT NOT NULL, text TEXT NOT NULL)"
+            )
+
+    def get(self, digest: bytes, version: str) -> Optional[str]:
+        """
+        Look up the cached text of a PDF.
+
+        Args:
+            digest: Hash of the PDF file contents
+            version: Version of the text extraction that must have produced the entry
+
+        Returns:
+            Cached text, or None on a miss or an entry from another version
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM pdf_text WHERE hash = ? AND version = ?",
+                (digest, version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, digest: bytes, version: str, text: str) -> None:
+        """
+        Store the text of a PDF, replacing any entry from another version.
+
+        Args:
+            digest: Hash of the PDF file contents
+            version: Version of the text extraction that produced the text
+            text: Cleaned text of the PDF
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_text (hash, version, text) VALUES (?, ?, ?)",
+                (digest, version, text)
+            )
@@ -0,0 +1,122 @@
+"""Compiled whitespace cleanup for extracted PDF text (uses numba when installed)."""
+
+import importlib.util
+import re
+import threading
+from typing import Any, Callable, Optional
+
+# numba is slow to import and compile, so both happen on first use
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+np: Any = None
+_compiled: Optional[Callable] = None
+_compile_lock = threading.Lock()
+
+# Whitespace outside ASCII (e.g. no-break spaces) is stripped by str.strip
+# but invisible to the byte loop; such text takes the regular Python path
+_NON_ASCII_SPACE_RE = re.compile(r"[^\S\x00-\x7f]")
+
+
+def _clean_bytes(buf):
+    """
+    Clean UTF-8 encoded text in a single pass.
+
+    Mirrors pdf_extractor._clean_text_python: each line is stripped of ASCII
+    whitespace, runs of spaces and tabs inside a line become one space,
+    consecutive empty lines collapse into one, and leading/trailing empty
+    lines are dropped. Multi-byte UTF-8 sequences never contain ASCII
+    bytes, so they are copied through untouched.
+
+    Args:
+        buf: uint8 array of the encoded text
+
+    Returns:
+        uint8 array of the cleaned text
+    """
+    n = buf.shape[0]
+    out = np.empty(n, dtype=np.uint8)
+    size = 0
+    prev_empty = False
+    wrote_line = False
+    pos = 0
+    while pos <= n:
+        # Find the end of the current line
+        end = pos
+        while end < n and buf[end] != 10:
+            end += 1
+
+        # Strip whitespace (str.isspace for ASCII, minus the newline)
+        start = pos
+        while start < end and (buf[start] == 32 or (9 <= buf[start] <= 13) or (28 <= buf[start] <= 31)):
+            start += 1
+        stop = end
+        while stop > start and (buf[stop - 1] == 32 or (9 <= buf[stop - 1] <= 13) or (28 <= buf[stop - 1] <= 31)):
+            stop -= 1
+
+        if stop > start or not prev_empty:
+            if wrote_line:
+                out[size] = 10
+                size += 1
+            in_space = False
+            for i in range(start, stop):
+                byte = buf[i]
+                if byte == 32 or byte == 9:
+                    if not in_space:
+                        out[size] = 32
+                        size += 1
+                    in_space = True
+                else:
+                    out[size] = byte
+                    size += 1
+                    in_space = False
+            wrote_line = True
+            prev_empty = stop == start
+
+        pos = end + 1
+
+    # Drop the newlines left by leading and trailing empty lines
+    first = 0
+    while first < size and out[first] == 10:
+        first += 1
+    while size > first and out[size - 1] == 10:
+        size -= 1
+    return out[first:size]
+
+
+def _get_compiled() -> Callable:
+    """Compile _clean_bytes with numba on first use."""
+    global np, _compiled
+    with _compile_lock:
+        if _compiled is None:
+            import numpy
+            from numba import njit, types
+
+            # _clean_bytes resolves np as a module global when compiled
+            np = numpy
+            # One signature (a read-only view of the encoded bytes), with the
+            # machine code cached on disk across processes
+            _compiled = njit(
+                types.uint8[::1](types.Array(types.uint8, 1, "C", readonly=True)),
+                cache=True
+            )(_clean_bytes)
+        return _compiled
+
+
+def clean_text(text: str) -> Optional[str]:
+    """
+    Clean extracted text with the compiled single-pass loop.
+
+    Args:
+        text: Raw extracted text
+
+    Returns:
+        Cleaned text, or None if numba is not installed or the text contains
+        non-ASCII whitespace, in which case the caller's Python
+        implementation must be used
+    """
+    if not HAS_NUMBA or _NON_ASCII_SPACE_RE.search(text):
+        return None
+
+    clean_bytes = _get_compiled()
+    buf = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    return clean_bytes(buf).tobytes().decode("utf-8")
@@ -0,0 +1,51 @@
+"""Section chunking and result merging for map-reduce extraction."""
+
+import copy
+
+from src.ai_extractor.base import _merge_extractions, _split_sections
+
+
+def test_split_sections_breaks_at_headings_within_limit():
+    text = (
+        "John Doe\njohn@example.com\n"
+        "EDUCATION\n" + "BSc in Computer Science, 2015\n" * 3
+        + "EXPERIENCE\n" + "Engineer at Acme, 2016-2020\n" * 3
+        + "Skills\nPython, SQL\n"
+    )
+    chunks = _split_sections(text, 120)
+
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert any(chunk.startswith("EDUCATION") for chunk in chunks)
+    assert any(chunk.startswith("EXPERIENCE") for chunk in chunks)
+    # Only whitespace at chunk edges is dropped
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+def test_split_sections_hard_splits_overlong_lines():
+    chunks = _split_sections("x" * 250, 100)
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+
+def test_merge_extractions_unions_lists_and_fills_empty_scalars():
+    first = {
+        "user_info": {"name": "Jane Doe", "email": ""},
+        "employment": [{"company_name": "Acme"}],
+        "skills": ["Python"]
+    }
+    second = {
+        "user_info": {"name": "", "email": "jane@example.com"},
+        "employment": [{"company_name": "Acme"}, {"company_name": "Globex"}],
+        "skills": ["Python", "SQL"]
+    }
+    originals = copy.deepcopy([first, second])
+
+    merged = _merge_extractions([first, second])
+
+    assert merged == {
+        "user_info": {"name": "Jane Doe", "email": "jane@example.com"},
+        "employment": [{"company_name": "Acme"}, {"company_name": "Globex"}],
+        "skills": ["Python", "SQL"]
+    }
+    # Inputs may be cache entries and must not be modified
+    assert [first, second] == originals
@@ -0,0 +1,32 @@
+"""Locating the JSON object in free-form Ollama responses."""
+
+import json
+
+from src.ai_extractor.ollama_extractor import _find_json_object
+
+
+def test_braces_and_escaped_quotes_inside_strings_are_ignored():
+    obj = '{"a": "x \\"}\\" {y", "b": {"c": "}"}}'
+    assert _find_json_object(obj + " trailing }") == obj
+    assert json.loads(_find_json_object(obj))["a"] == 'x "}" {y'
+
+
+def test_escaped_backslash_before_closing_quote():
+    obj = '{"path": "C:\\\\", "next": "}"}'
+    assert _find_json_object(obj) == obj
+    assert json.loads(obj)["path"] == "C:\\"
+
+
+def test_fenced_block_with_surrounding_text():
+    obj = '{"skills": ["Python", "SQL"]}'
+    text = f"Here is the result:\n```json\n{obj}\n```\nLet me know if you need anything else {{}}."
+    assert _find_json_object(text) == obj
+
+
+def test_unclosed_object_returns_text_up_to_last_closing_brace():
+    text = '{"user_info": {"name": "Jane"}, "skills": ["Py'
+    assert _find_json_object(text) == '{"user_info": {"name": "Jane"}'
+
+
+def test_text_without_braces():
+    assert _find_json_object("no json here") is None
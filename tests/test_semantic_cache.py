@@ -0,0 +1,75 @@
+"""Crash recovery of the semantic cache's embedding and result files."""
+
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ai_extractor.semantic_cache import SemanticCache
+
+DIM = 4
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    # Lookups and appends never load the embedding model
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.ModuleType("sentence_transformers"))
+    return lambda: SemanticCache(tmp_path)
+
+
+def _vectors(*indices):
+    return np.eye(DIM, dtype=np.float32)[list(indices)]
+
+
+def _assert_aligned(cache, count):
+    assert cache._results == [{"n": i} for i in range(count)]
+    assert cache._embeddings_path.stat().st_size == count * DIM * 4
+    assert cache.lookup(_vectors(*range(count))) == [{"n": i} for i in range(count)]
+
+
+def test_orphan_result_lines_are_dropped_before_appending(make_cache):
+    make_cache().add(_vectors(0, 1), [{"n": 0}, {"n": 1}])
+    # Results written, embeddings write failed
+    with open(make_cache()._results_path, "ab") as f:
+        f.write(b'{"n": 99}\n')
+
+    make_cache().add(_vectors(2), [{"n": 2}])
+
+    _assert_aligned(make_cache(), 3)
+
+
+def test_partial_embedding_row_is_dropped_before_appending(make_cache):
+    cache = make_cache()
+    cache.add(_vectors(0, 1), [{"n": 0}, {"n": 1}])
+    with open(cache._embeddings_path, "ab") as f:
+        f.write(b"\0" * 5)
+
+    make_cache().add(_vectors(2), [{"n": 2}])
+
+    _assert_aligned(make_cache(), 3)
+
+
+def test_partial_result_line_is_ignored_and_overwritten(make_cache):
+    cache = make_cache()
+    cache.add(_vectors(0, 1), [{"n": 0}, {"n": 1}])
+    with open(cache._results_path, "ab") as f:
+        f.write(b'{"n": ')
+
+    reloaded = make_cache()
+    assert len(reloaded._results) == 2
+    reloaded.add(_vectors(2), [{"n": 2}])
+
+    _assert_aligned(make_cache(), 3)
+
+
+def test_write_errors_are_not_raised(make_cache, monkeypatch):
+    cache = make_cache()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache, "_truncate_to_common_rows", fail)
+    cache.add(_vectors(0), [{"n": 0}])
+    assert cache._results == []
@@ -0,0 +1,25 @@
+"""The compiled text cleanup must produce the same text as the Python one."""
+
+import random
+
+import pytest
+
+from src import text_clean
+from src.pdf_extractor import _clean_text_python
+
+pytest.importorskip("numba")
+
+# ASCII whitespace handled by the byte loop, plus letters and multi-byte
+# characters that must pass through unchanged
+_ALPHABET = " \t\n\r\x0b\x0c\x1c\x1fab-é€😀"
+
+
+def test_compiled_cleanup_matches_python():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = "".join(rng.choice(_ALPHABET) for _ in range(rng.randrange(40)))
+        assert text_clean.clean_text(text) == _clean_text_python(text), repr(text)
+
+
+def test_non_ascii_whitespace_uses_python_cleanup():
+    assert text_clean.clean_text("a\xa0b") is None